@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'inventory.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -83,6 +84,52 @@ DATABASES = {
 }
 
 
+# Cache
+# 카탈로그 캐시 등에 사용 — 여러 프로세스로 운영할 경우 Redis/Memcached 등 공유 캐시로 변경
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'dongsan-inventory',
+    }
+}
+
+
+# Query budget
+# 요청별 쿼리 수 예산 (URL 이름 기준) — 넘으면 inventory.query_budget 로거에 경고
+# inventory.testing.QueryBudgetTestMixin 이 시드 데이터로 모든 URL 을 이 예산과 비교함
+# DEBUG 면 응답 헤더 X-DB-Query-Count / X-DB-Time-Ms 로 확인 가능
+
+INVENTORY_QUERY_BUDGETS = {
+    'default': 30,
+    'kiosk_input': 5,
+    'kiosk_input_ajax': 8,
+    'add_stock': 5,
+    'add_stock_ajax': 8,
+    'add_item_ajax': 18,
+    'inventory_status': 6,
+    'stock_as_of': 6,
+    'export_stock_as_of': 6,
+    'inventory_history': 5,
+    'cancel_out_log': 8,
+    'export_inventory_log': 3,
+    'paste_table_upload': 6,
+    'pending_stock_list': 6,
+    'get_batch_items': 3,
+    'process_pending_stock': 14,
+    'process_pending_batches': 14,
+    'update_pending_quantities': 6,
+    'cancel_pending_stock': 4,
+    'search_variants_api': 4,
+    'suggest_variants_api': 2,
+    'usage_stat': 4,
+    'export_usage_stat_excel': 3,
+    'usage_pivot': 3,
+    'usage_pivot_api': 3,
+}
+INVENTORY_DB_TIME_BUDGET_MS = 500
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -1,9 +1,15 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import Q
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from .models import (
     UsageCategory, Item, Spec, ProductVariant,
-    InventoryUser, InventoryLog,
+    InventoryUser, InventoryLog, DailyUsage, CodeSequence, LowStockEvent, StockSnapshot, VariantForecast,
     PendingStockBatch, PendingStockItem
 )
+from .services.reconcile import find_drift, repair_drift
+from .services.search import rank_variants
 
 @admin.register(UsageCategory)
 class UsageCategoryAdmin(admin.ModelAdmin):
@@ -21,18 +27,52 @@ class ItemAdmin(admin.ModelAdmin):
 
 @admin.register(Spec)
 class SpecAdmin(admin.ModelAdmin):
-    list_display = ['id', 'label']
+    list_display = ['id', 'label', 'sort_key', 'unit']
     search_fields = ['label']
 
 
 @admin.register(ProductVariant)
 class ProductVariantAdmin(admin.ModelAdmin):
-    list_display = ['id', 'item', 'spec', 'code', 'min_quantity', 'current_quantity']
-    list_filter = ['item', 'spec']
+    list_display = ['id', 'item', 'spec', 'code', 'min_quantity', 'current_quantity', 'is_low']
+    list_filter = ['is_low', 'item', 'spec']
     search_fields = ['code', 'item__name', 'spec__label']
     autocomplete_fields = ['item', 'spec']
     readonly_fields = ['code']
 
+    def get_search_results(self, request, queryset, search_term):
+        # 검색 색인 사용 (코드는 앞부분 일치)
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        matched = rank_variants(search_term, queryset).values('id')
+        return queryset.filter(Q(id__in=matched) | Q(code__istartswith=search_term.strip())), False
+
+    def get_urls(self):
+        return [
+            path('reconcile/', self.admin_site.admin_view(self.reconcile_view), name='inventory_productvariant_reconcile'),
+        ] + super().get_urls()
+
+    def reconcile_view(self, request):
+        # 현재 재고 vs 입출고 기록 장부 재고 비교 (POST 시 선택 품목을 장부 재고로 수정)
+        if not self.has_change_permission(request):
+            return redirect('admin:index')
+        if request.method == 'POST':
+            variant_ids = [int(v) for v in request.POST.getlist('variant_ids') if v.isdigit()]
+            repaired = repair_drift(variant_ids)
+            self.message_user(request, f"{repaired}건의 현재 재고를 장부 재고로 맞췄습니다.", messages.SUCCESS)
+            return redirect('admin:inventory_productvariant_reconcile')
+        return TemplateResponse(request, 'admin/inventory/productvariant/reconcile.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': '재고 장부 대사',
+            'report': find_drift(),
+        })
+
+
+@admin.register(CodeSequence)
+class CodeSequenceAdmin(admin.ModelAdmin):
+    list_display = ['id', 'prefix', 'last_value']
+    search_fields = ['prefix']
+
 
 @admin.register(InventoryUser)
 class InventoryUserAdmin(admin.ModelAdmin):
@@ -50,6 +90,42 @@ class InventoryLogAdmin(admin.ModelAdmin):
     readonly_fields = ['timestamp']
 
 
+@admin.register(VariantForecast)
+class VariantForecastAdmin(admin.ModelAdmin):
+    list_display = ['id', 'variant', 'avg_daily', 'ewma_daily', 'days_of_cover', 'reorder_point', 'computed_at']
+    search_fields = ['variant__code', 'variant__item__name']
+    ordering = ['days_of_cover']
+    autocomplete_fields = ['variant']
+
+
+@admin.register(StockSnapshot)
+class StockSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['id', 'date', 'variant', 'quantity']
+    list_filter = ['date']
+    search_fields = ['variant__code', 'variant__item__name']
+    ordering = ['-date']
+    autocomplete_fields = ['variant']
+
+
+@admin.register(LowStockEvent)
+class LowStockEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'variant', 'is_low', 'quantity', 'min_quantity', 'created_at', 'processed_at']
+    list_filter = ['is_low', 'processed_at']
+    search_fields = ['variant__code', 'variant__item__name']
+    ordering = ['-created_at']
+    autocomplete_fields = ['variant']
+    readonly_fields = ['created_at']
+
+
+@admin.register(DailyUsage)
+class DailyUsageAdmin(admin.ModelAdmin):
+    list_display = ['id', 'date', 'type', 'user', 'variant', 'quantity']
+    list_filter = ['type', 'date']
+    search_fields = ['user__name', 'variant__code', 'variant__item__name']
+    ordering = ['-date']
+    autocomplete_fields = ['user', 'variant']
+
+
 # 🔽 입고 대기 품목 Inline
 class PendingStockItemInline(admin.TabularInline):
     model = PendingStockItem
@@ -1,6 +1,6 @@
-from .models import UsageCategory
+from .services.dimensions import get_categories
 
 def common_categories(request):
     return {
-        'categories': UsageCategory.objects.all()
+        'categories': get_categories()
     }
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import localtime
+
+from inventory.services.alerts import drain_low_stock_events
+
+
+class Command(BaseCommand):
+    help = "재고 부족 알림 대기열(LowStockEvent)을 품목별 요약으로 출력하고 처리 완료로 표시합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="처리 완료로 표시하지 않고 출력만 합니다.")
+
+    def handle(self, *args, **options):
+        digest = drain_low_stock_events(mark_processed=not options['dry_run'])
+        if not digest:
+            self.stdout.write("새 재고 부족 알림이 없습니다.")
+            return
+
+        low = [row for row in digest if row['is_low']]
+        self.stdout.write(f"📦 재고 부족 알림 요약 — 부족 {len(low)}건, 해소 {len(digest) - len(low)}건")
+        for row in digest:
+            state = "⚠️ 부족" if row['is_low'] else "✅ 해소"
+            self.stdout.write(
+                f"{state} {row['variant']} 재고 {row['quantity']} / 안전 재고 {row['min_quantity']}"
+                f" (변경 {row['changes']}회, 마지막 {localtime(row['last_at']):%Y-%m-%d %H:%M})"
+            )
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"✅ 알림 {len(digest)}건을 처리했습니다."))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory.services.forecast import EWMA_SPAN, HISTORY_DAYS, LEAD_TIME_DAYS, WINDOW_DAYS, refresh_forecasts
+
+
+class Command(BaseCommand):
+    help = "일별 소모 기록으로 품목규격별 일평균 소모, 재고 소진 일수, 권장 발주점을 계산합니다. (매일 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=HISTORY_DAYS, help=f"조회 기간 (기본 {HISTORY_DAYS}일)")
+        parser.add_argument('--window', type=int, default=WINDOW_DAYS, help=f"이동평균 기간 (기본 {WINDOW_DAYS}일)")
+        parser.add_argument('--span', type=int, default=EWMA_SPAN, help=f"지수가중 평균 기간 (기본 {EWMA_SPAN}일)")
+        parser.add_argument('--lead-time', type=int, default=LEAD_TIME_DAYS, help=f"입고 소요 일수 (기본 {LEAD_TIME_DAYS}일)")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        saved = refresh_forecasts(
+            options['days'],
+            window=options['window'],
+            span=options['span'],
+            lead_time=options['lead_time'],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"✅ 소모 예측 {saved}건을 저장했습니다. ({elapsed:.2f}초)"))
@@ -0,0 +1,284 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from inventory.middleware import is_counted_query
+from inventory.models import (
+    InventoryLog, InventoryUser, Item, PendingStockBatch, PendingStockItem, ProductVariant, Spec, UsageCategory,
+)
+from inventory.services.rollup import rebuild_daily_usage
+from inventory.services.search import rebuild_search_index
+from inventory.utils import encode_cursor
+
+ITEM_WORDS = ['장갑', '마스크', '테이프', '볼트', '너트', '현수막', '케이블', '필터', '호스', '브러시', '걸레', '비닐']
+SPEC_LABELS = ['S', 'M', 'L', 'XL'] + [f"{n}mm" for n in range(10, 310, 10)] + [f"{n}폭" for n in range(30, 130, 10)]
+SPECS_PER_ITEM = 5
+HISTORY_DAYS = 730
+BENCH_DB_NAME = 'inventory_bench.sqlite3'
+SCENARIOS = [
+    'kiosk_page', 'kiosk_submit', 'history_deep', 'usage_stat_year',
+    'export_log', 'paste_upload', 'process_pending',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "테스트 DB 에 가상 데이터를 만들고 주요 화면/요청의 응답 시간(p50/p95/p99), 쿼리 수, 최대 메모리를 측정합니다. "
+        "운영 DB 는 건드리지 않습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--variants', type=int, default=5000, help="품목규격 수 (기본 5000)")
+        parser.add_argument('--users', type=int, default=50, help="사용자 수 (기본 50)")
+        parser.add_argument('--logs', type=int, default=5_000_000, help="입출고 기록 수 (기본 5,000,000)")
+        parser.add_argument('--iterations', type=int, default=20, help="시나리오별 반복 횟수 (기본 20)")
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="쉼표로 구분한 시나리오 목록")
+        parser.add_argument('--seed', type=int, default=1, help="난수 시드 (같은 값이면 같은 데이터)")
+        parser.add_argument('--output', help="결과를 저장할 JSON 파일 경로")
+        parser.add_argument('--keepdb', action='store_true', help="테스트 DB 를 지우지 않고 다음 실행에 재사용")
+        parser.add_argument(
+            '--db-path',
+            help=f"SQLite 테스트 DB 파일 경로 (기본: 설정의 TEST['NAME'], 없으면 프로젝트 폴더의 {BENCH_DB_NAME})",
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations 는 1 이상이어야 합니다.")
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"알 수 없는 시나리오: {', '.join(sorted(unknown))} (가능: {', '.join(SCENARIOS)})")
+        self.rng = random.Random(options['seed'])
+        self.configure_test_db(options['db_path'], options['keepdb'])
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            if ProductVariant.objects.exists():
+                self.stdout.write("기존 테스트 DB 데이터를 사용합니다.")
+            else:
+                self.generate(options['variants'], options['users'], options['logs'])
+            results = {name: self.run_scenario(name, options['iterations']) for name in scenarios}
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        self.print_results(results)
+        if options['output']:
+            report = {
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'scale': {key: options[key] for key in ('variants', 'users', 'logs', 'iterations', 'seed')},
+                'results': results,
+            }
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✅ 결과를 {options['output']} 에 저장했습니다."))
+
+    def configure_test_db(self, db_path, keepdb):
+        """
+        SQLite 테스트 DB 를 파일로 지정 — 기본값(메모리 DB)은 수백만 건을 모두 메모리에 올리고
+        프로세스가 끝나면 사라지므로 --keepdb 로 재사용할 수 없음
+        """
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        if connection.vendor != 'sqlite':
+            if db_path:
+                raise CommandError("--db-path 는 SQLite 에서만 사용할 수 있습니다.")
+            return
+        test_settings['NAME'] = db_path or test_settings.get('NAME') or str(settings.BASE_DIR / BENCH_DB_NAME)
+        if keepdb and connection.creation.is_in_memory_db(test_settings['NAME']):
+            raise CommandError("메모리 테스트 DB 는 실행이 끝나면 사라지므로 --keepdb 를 쓸 수 없습니다. --db-path 로 파일을 지정하세요.")
+        self.stdout.write(f"테스트 DB: {test_settings['NAME']}")
+
+    # === 가상 데이터 생성 ===
+    def generate(self, variant_count, user_count, log_count):
+        started = time.perf_counter()
+        rng = self.rng
+        with transaction.atomic():
+            categories = UsageCategory.objects.bulk_create([UsageCategory(name=f"사용처{n}") for n in range(1, 9)])
+            InventoryUser.objects.bulk_create(
+                [InventoryUser(name=f"사용자{n:03d}") for n in range(1, user_count + 1)] + [InventoryUser(name="system")]
+            )
+
+            specs = [Spec(label=label) for label in SPEC_LABELS]
+            for spec in specs:
+                spec.set_sort_key()
+            specs = Spec.objects.bulk_create(specs)
+
+            item_count = -(-variant_count // SPECS_PER_ITEM)
+            items = []
+            for n in range(item_count):
+                name = f"{ITEM_WORDS[n % len(ITEM_WORDS)]}{n:05d}"
+                items.append(Item(name=name, category=rng.choice(categories), description=f"{name} 설명"))
+            items = Item.objects.bulk_create(items, batch_size=2000)
+
+            variants = []
+            for item in items:
+                for spec in rng.sample(specs, SPECS_PER_ITEM):
+                    if len(variants) == variant_count:
+                        break
+                    variant = ProductVariant(
+                        item=item, spec=spec, code=f"BN{len(variants):07d}",
+                        current_quantity=rng.randint(1_000, 100_000), min_quantity=rng.randint(0, 50),
+                        unit_price=rng.randint(1, 500) * 100,
+                    )
+                    variant.set_search_keys(item.name, spec.label)
+                    variants.append(variant)
+            ProductVariant.objects.bulk_create(variants, batch_size=2000)
+        rebuild_search_index()
+        self.stdout.write(f"품목 {item_count}개, 품목규격 {variant_count}개, 사용자 {user_count}명 생성")
+
+        variant_ids = list(ProductVariant.objects.values_list('id', flat=True))
+        user_ids = list(InventoryUser.objects.values_list('id', flat=True))
+        now = timezone.now()
+        span = HISTORY_DAYS * 24 * 3600
+        chunk = 20_000
+        for offset in range(0, log_count, chunk):
+            InventoryLog.objects.bulk_create(
+                [
+                    InventoryLog(
+                        user_id=rng.choice(user_ids),
+                        variant_id=rng.choice(variant_ids),
+                        quantity=rng.randint(1, 5),
+                        type='IN' if rng.random() < 0.15 else 'OUT',
+                        timestamp=now - timedelta(seconds=rng.randrange(span)),
+                    )
+                    for _ in range(min(chunk, log_count - offset))
+                ],
+                batch_size=5000,
+            )
+            if offset and offset % 1_000_000 == 0:
+                self.stdout.write(f"  입출고 기록 {offset:,}건...")
+        rebuild_daily_usage()
+        self.stdout.write(f"입출고 기록 {log_count:,}건 생성 ({time.perf_counter() - started:.1f}초)")
+
+    # === 시나리오 ===
+    # scenario_* 는 준비 함수를 돌려줌: 준비 함수는 요청 직전 데이터를 만들고(측정 제외) 요청 함수를 반환
+    def _sample_variants(self, count):
+        if not hasattr(self, '_variant_rows'):
+            self._variant_rows = list(
+                ProductVariant.objects.values_list('id', 'item_id', 'spec_id', 'item__name', 'spec__label')
+            )
+        return self.rng.sample(self._variant_rows, min(count, len(self._variant_rows)))
+
+    def scenario_kiosk_page(self):
+        return lambda: lambda client: client.get(reverse('kiosk_input'))
+
+    def scenario_kiosk_submit(self):
+        user_id = InventoryUser.objects.exclude(name="system").values_list('id', flat=True).first()
+
+        def prepare():
+            lines = [{'id': row[0], 'qty': 1} for row in self._sample_variants(20)]
+            return lambda client: client.post(
+                reverse('kiosk_input_ajax'), {'user': user_id, 'variants': lines}, content_type='application/json'
+            )
+        return prepare
+
+    def scenario_history_deep(self):
+        logs = InventoryLog.objects.order_by('-timestamp', '-id')
+        total = logs.count()
+        cursors = [
+            encode_cursor('next', logs[int(total * depth)])
+            for depth in (0.5, 0.8, 0.95) if int(total * depth) < total
+        ] + [encode_cursor('prev')]
+
+        def prepare():
+            cursor = self.rng.choice(cursors)
+            return lambda client: client.get(reverse('inventory_history'), {'cursor': cursor})
+        return prepare
+
+    def scenario_usage_stat_year(self):
+        today = timezone.localdate()
+        params = {'start_date': (today - timedelta(days=365)).isoformat(), 'end_date': today.isoformat()}
+        return lambda: lambda client: client.get(reverse('usage_stat'), params)
+
+    def scenario_export_log(self):
+        params = {'start_date': (timezone.localdate() - timedelta(days=30)).isoformat(), 'format': 'csv'}
+        return lambda: lambda client: client.get(reverse('export_inventory_log'), params)
+
+    def scenario_paste_upload(self):
+        date = timezone.localdate().isoformat()
+
+        def prepare():
+            rows = [
+                [date, f"거래처{n % 5}", item_name, spec_label, str(self.rng.randint(1, 100))]
+                for n, (_, _, _, item_name, spec_label) in enumerate(self._sample_variants(1000))
+            ]
+            return lambda client: client.post(reverse('paste_table_upload'), {'json_data': json.dumps(rows)})
+        return prepare
+
+    def scenario_process_pending(self):
+        def prepare():
+            batch = PendingStockBatch.objects.create(supplier="벤치마크", uploaded_at=timezone.now())
+            entries = PendingStockItem.objects.bulk_create([
+                PendingStockItem(batch=batch, item_id=item_id, spec_id=spec_id, quantity=self.rng.randint(1, 100))
+                for _, item_id, spec_id, _, _ in self._sample_variants(50)
+            ])
+            quantities = [{'id': entry.id, 'qty': entry.quantity} for entry in entries]
+            return lambda client: client.post(
+                reverse('process_pending_stock', args=[batch.id]), {'quantities': quantities},
+                content_type='application/json'
+            )
+        return prepare
+
+    def run_scenario(self, name, iterations):
+        prepare = getattr(self, f"scenario_{name}")()
+        client = Client()
+
+        def call(request):
+            response = request(client)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            return response.status_code
+
+        call(prepare())  # 워밍업 (캐시 등)
+        timings, queries, statuses = [], [], {}
+        for _ in range(iterations):
+            request = prepare()
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                status = call(request)
+                timings.append((time.perf_counter() - started) * 1000)
+            # 쿼리 예산과 같은 기준 (저장점 제외)
+            queries.append(sum(1 for q in ctx.captured_queries if is_counted_query(q['sql'])))
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+        # 메모리 측정은 tracemalloc 부담이 시간에 섞이지 않도록 따로 1회
+        request = prepare()
+        tracemalloc.start()
+        call(request)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        cuts = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+        return {
+            'iterations': iterations,
+            'p50_ms': round(cuts[49], 2),
+            'p95_ms': round(cuts[94], 2),
+            'p99_ms': round(cuts[98], 2),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'queries': max(queries),
+            'peak_memory_kb': round(peak / 1024, 1),
+            'status_codes': statuses,
+        }
+
+    def print_results(self, results):
+        self.stdout.write(f"{'시나리오':<18}{'p50':>10}{'p95':>10}{'p99':>10}{'쿼리':>8}{'메모리(KB)':>14}  상태")
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<18}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+                f"{r['queries']:>8}{r['peak_memory_kb']:>14.1f}  {r['status_codes']}"
+            )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from inventory.services.rollup import rebuild_daily_usage
+
+
+class Command(BaseCommand):
+    help = "입출고 기록(InventoryLog)으로 일별 사용 집계(DailyUsage)를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="시작일 (YYYY-MM-DD, 미지정 시 전체)")
+        parser.add_argument('--end', help="종료일 (YYYY-MM-DD, 포함)")
+
+    def handle(self, *args, **options):
+        created = rebuild_daily_usage(options['start'], options['end'])
+        self.stdout.write(self.style.SUCCESS(f"✅ 일별 집계 {created}건을 생성했습니다."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from inventory.services.reconcile import find_drift, repair_drift
+
+
+class Command(BaseCommand):
+    help = "현재 재고(current_quantity)와 입출고 기록 기준 장부 재고를 비교해 차이를 보고합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true', help="차이가 있는 품목의 현재 재고를 장부 재고로 맞춥니다.")
+        parser.add_argument('--limit', type=int, default=50, help="출력할 최대 행 수 (기본 50, 0 이면 전체)")
+
+    def handle(self, *args, **options):
+        report = find_drift()
+        if not report:
+            self.stdout.write(self.style.SUCCESS("✅ 모든 품목의 재고가 장부와 일치합니다."))
+            return
+
+        self.stdout.write(self.style.WARNING(f"⚠️ 장부와 다른 품목 {len(report)}건"))
+        shown = report[:options['limit']] if options['limit'] else report
+        for row in shown:
+            self.stdout.write(
+                f"{row['code']:<14} {row['label']} 현재 {row['current']} / 장부 {row['ledger']} (차이 {row['drift']:+d})"
+            )
+        if len(shown) < len(report):
+            self.stdout.write(f"... 외 {len(report) - len(shown)}건")
+
+        if options['repair']:
+            repaired = repair_drift([row['variant_id'] for row in report])
+            self.stdout.write(self.style.SUCCESS(f"✅ {repaired}건의 현재 재고를 장부 재고로 맞췄습니다."))
@@ -0,0 +1,22 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.services.snapshots import take_stock_snapshot
+from inventory.utils import safe_date
+
+
+class Command(BaseCommand):
+    help = "일자 마감 재고 스냅샷(StockSnapshot)을 저장합니다. 매일 자정 이후 실행하세요."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="마감 일자 (YYYY-MM-DD, 미지정 시 어제)")
+
+    def handle(self, *args, **options):
+        date = safe_date(options['date'])
+        if options['date'] and not date:
+            raise CommandError("일자 형식이 올바르지 않습니다. (YYYY-MM-DD)")
+        try:
+            created = take_stock_snapshot(date)
+        except ValidationError as ve:
+            raise CommandError(" ".join(ve.messages))
+        self.stdout.write(self.style.SUCCESS(f"✅ 재고 스냅샷 {created}건을 저장했습니다."))
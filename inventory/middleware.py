@@ -0,0 +1,77 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('inventory.query_budget')
+
+
+def get_query_budget(url_name):
+    """
+    URL 이름별 쿼리 수 예산 (settings.INVENTORY_QUERY_BUDGETS, 없으면 'default')
+    """
+    budgets = getattr(settings, 'INVENTORY_QUERY_BUDGETS', {})
+    return budgets.get(url_name, budgets.get('default'))
+
+
+def is_counted_query(sql):
+    """
+    쿼리 예산에 포함하는 SQL 인지 — 저장점(SAVEPOINT/RELEASE SAVEPOINT) 은 제외
+    (미들웨어와 inventory.testing 이 같은 기준으로 셈)
+    """
+    return not sql.lstrip().upper().startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT'))
+
+
+class QueryCounter:
+    """
+    connection.execute_wrapper 로 실행되는 쿼리 수와 DB 시간을 셈 (DEBUG 와 무관하게 동작, 저장점 제외)
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            if is_counted_query(sql):
+                self.count += 1
+
+
+class QueryBudgetMiddleware:
+    """
+    요청별 쿼리 수/DB 시간 측정 — 예산을 넘으면 경고 로그, DEBUG 면 응답 헤더로 노출
+    X-DB-Query-Count, X-DB-Time-Ms (스트리밍 다운로드는 응답을 보내는 동안의 쿼리가 포함되지 않음)
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        wrappers = [connections[alias].execute_wrapper(counter) for alias in connections]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+
+        db_ms = counter.duration * 1000
+        match = getattr(request, 'resolver_match', None)
+        url_name = match.url_name if match else None
+        budget = get_query_budget(url_name)
+        time_budget = getattr(settings, 'INVENTORY_DB_TIME_BUDGET_MS', None)
+        if (budget is not None and counter.count > budget) or (time_budget is not None and db_ms > time_budget):
+            logger.warning(
+                "쿼리 예산 초과: %s %s (%s) 쿼리 %d건 / 예산 %s건, DB %.1fms",
+                request.method, request.path, url_name, counter.count, budget, db_ms,
+            )
+
+        if settings.DEBUG:
+            response['X-DB-Query-Count'] = str(counter.count)
+            response['X-DB-Time-Ms'] = f"{db_ms:.1f}"
+        return response
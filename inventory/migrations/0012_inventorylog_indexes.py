@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0011_productvariant_unit_price'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pendingstockbatch',
+            name='uploaded_at',
+            field=models.DateTimeField(verbose_name='입고 예정일'),
+        ),
+        migrations.AddIndex(
+            model_name='inventorylog',
+            index=models.Index(fields=['type', 'timestamp'], name='invlog_type_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventorylog',
+            index=models.Index(fields=['variant', 'timestamp'], name='invlog_variant_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventorylog',
+            index=models.Index(fields=['user', 'timestamp'], name='invlog_user_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:46
+
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def backfill_daily_usage(apps, schema_editor):
+    InventoryLog = apps.get_model('inventory', 'InventoryLog')
+    DailyUsage = apps.get_model('inventory', 'DailyUsage')
+    rows = (
+        InventoryLog.objects.annotate(day=TruncDate('timestamp'))
+        .values('day', 'variant_id', 'user_id', 'type')
+        .annotate(total=Sum('quantity'))
+        .order_by()
+    )
+    DailyUsage.objects.bulk_create(
+        (DailyUsage(date=r['day'], variant_id=r['variant_id'], user_id=r['user_id'],
+                    type=r['type'], quantity=r['total']) for r in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0012_inventorylog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='일자')),
+                ('type', models.CharField(choices=[('IN', '입고'), ('OUT', '소모')], max_length=3, verbose_name='입출고 구분')),
+                ('quantity', models.IntegerField(default=0, verbose_name='수량')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='inventory.inventoryuser', verbose_name='담당자')),
+                ('variant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='inventory.productvariant', verbose_name='품목 규격')),
+            ],
+            options={
+                'verbose_name': '일별 사용 집계',
+                'verbose_name_plural': '일별 사용 집계',
+                'indexes': [models.Index(fields=['type', 'date'], name='dailyusage_type_date_idx'), models.Index(fields=['date', 'variant', 'user', 'type'], name='dailyusage_key_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_usage, migrations.RunPython.noop),
+    ]
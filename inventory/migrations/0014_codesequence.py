@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:50
+
+import re
+
+from django.db import migrations, models
+
+
+def seed_code_sequences(apps, schema_editor):
+    ProductVariant = apps.get_model('inventory', 'ProductVariant')
+    CodeSequence = apps.get_model('inventory', 'CodeSequence')
+    last_values = {}
+    for code in ProductVariant.objects.exclude(code__isnull=True).values_list('code', flat=True).iterator():
+        match = re.match(r'^(.+)-(\d+)$', code)
+        if match:
+            prefix, number = match.group(1), int(match.group(2))
+            last_values[prefix] = max(last_values.get(prefix, 0), number)
+    CodeSequence.objects.bulk_create(
+        [CodeSequence(prefix=prefix, last_value=value) for prefix, value in last_values.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0013_dailyusage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=20, unique=True, verbose_name='코드 접두어')),
+                ('last_value', models.PositiveIntegerField(default=0, verbose_name='마지막 번호')),
+            ],
+            options={
+                'verbose_name': '품목 코드 일련번호',
+                'verbose_name_plural': '품목 코드 일련번호',
+            },
+        ),
+        migrations.RunPython(seed_code_sequences, migrations.RunPython.noop),
+    ]
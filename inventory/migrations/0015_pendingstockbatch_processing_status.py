@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0014_codesequence'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pendingstockbatch',
+            name='status',
+            field=models.CharField(choices=[('PENDING', '대기'), ('PROCESSING', '처리중'), ('DONE', '완료'), ('CANCELED', '취소')], default='PENDING', max_length=10, verbose_name='상태'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:53
+
+import re
+
+from django.db import migrations, models
+
+
+def _tokens(text):
+    text = re.sub(r'\s+', '', (text or '').lower())
+    return {*text, *(text[i:i + 2] for i in range(len(text) - 1))}
+
+
+def build_search_index(apps, schema_editor):
+    Item = apps.get_model('inventory', 'Item')
+    Spec = apps.get_model('inventory', 'Spec')
+    SearchToken = apps.get_model('inventory', 'SearchToken')
+    rows = []
+    for item in Item.objects.iterator():
+        for field in ('name', 'description'):
+            rows += [SearchToken(kind='item', object_id=item.pk, field=field, token=t)
+                     for t in _tokens(getattr(item, field))]
+    for spec in Spec.objects.iterator():
+        rows += [SearchToken(kind='spec', object_id=spec.pk, field='label', token=t)
+                 for t in _tokens(spec.label)]
+    SearchToken.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0015_pendingstockbatch_processing_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('item', '품목'), ('spec', '규격')], max_length=4, verbose_name='대상')),
+                ('object_id', models.BigIntegerField(verbose_name='대상 ID')),
+                ('field', models.CharField(max_length=20, verbose_name='필드')),
+                ('token', models.CharField(max_length=2, verbose_name='조각')),
+            ],
+            options={
+                'verbose_name': '검색 색인',
+                'verbose_name_plural': '검색 색인',
+                'indexes': [models.Index(fields=['kind', 'token', 'object_id'], name='searchtoken_lookup_idx'), models.Index(fields=['kind', 'object_id'], name='searchtoken_object_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:55
+
+import re
+
+from django.db import migrations, models
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+
+
+def _normalize(text):
+    return re.sub(r'\s+', '', (text or '').lower())
+
+
+def _chosung(text):
+    result = []
+    for ch in _normalize(text):
+        code = ord(ch) - 0xAC00
+        result.append(CHOSUNG[code // 588] if 0 <= code < 11172 else ch)
+    return ''.join(result)
+
+
+def fill_search_keys(apps, schema_editor):
+    ProductVariant = apps.get_model('inventory', 'ProductVariant')
+    variants = list(ProductVariant.objects.select_related('item', 'spec'))
+    for variant in variants:
+        text = f"{variant.item.name}{variant.spec.label}"
+        variant.search_name = _normalize(text)
+        variant.search_initials = _chosung(text)
+    ProductVariant.objects.bulk_update(variants, ['search_name', 'search_initials'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0016_searchtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productvariant',
+            name='search_initials',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200, verbose_name='검색용 초성'),
+        ),
+        migrations.AddField(
+            model_name='productvariant',
+            name='search_name',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200, verbose_name='검색용 이름'),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:57
+
+import re
+
+from django.db import migrations, models
+
+SPEC_NUMBER_RE = re.compile(r'(\d+)\s*([^\d\s]*)')
+
+
+def fill_sort_keys(apps, schema_editor):
+    Spec = apps.get_model('inventory', 'Spec')
+    specs = list(Spec.objects.all())
+    for spec in specs:
+        match = SPEC_NUMBER_RE.search(spec.label or '')
+        if match:
+            spec.sort_key = min(int(match.group(1)), 2 ** 63 - 1)
+            spec.unit = match.group(2)[:20]
+    Spec.objects.bulk_update(specs, ['sort_key', 'unit'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0017_search_keys'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='productvariant',
+            options={'ordering': ['item__name', 'spec__sort_key', 'spec__label'], 'verbose_name': '품목 규격', 'verbose_name_plural': '품목 규격'},
+        ),
+        migrations.AlterModelOptions(
+            name='spec',
+            options={'ordering': ['sort_key', 'label'], 'verbose_name': '규격', 'verbose_name_plural': '규격'},
+        ),
+        migrations.AddField(
+            model_name='spec',
+            name='sort_key',
+            field=models.PositiveBigIntegerField(default=0, editable=False, help_text='라벨의 첫 숫자 (자연 정렬용)', verbose_name='정렬 숫자'),
+        ),
+        migrations.AddField(
+            model_name='spec',
+            name='unit',
+            field=models.CharField(blank=True, editable=False, max_length=20, verbose_name='단위'),
+        ),
+        migrations.AddIndex(
+            model_name='spec',
+            index=models.Index(fields=['sort_key', 'label'], name='spec_sort_idx'),
+        ),
+        migrations.RunPython(fill_sort_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:58
+
+from django.db import migrations, models
+from django.db.models import F
+import django.db.models.deletion
+
+
+def fill_is_low(apps, schema_editor):
+    # 기존 부족 품목은 상태만 맞추고 알림(LowStockEvent)은 만들지 않음
+    ProductVariant = apps.get_model('inventory', 'ProductVariant')
+    ProductVariant.objects.filter(current_quantity__lt=F('min_quantity')).update(is_low=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0018_spec_sort_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productvariant',
+            name='is_low',
+            field=models.BooleanField(db_index=True, default=False, editable=False, help_text='현재 재고 < 안전 재고 (재고 변경 시 갱신)', verbose_name='재고 부족'),
+        ),
+        migrations.CreateModel(
+            name='LowStockEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_low', models.BooleanField(help_text='True = 부족 진입, False = 부족 해소', verbose_name='재고 부족')),
+                ('quantity', models.PositiveIntegerField(verbose_name='당시 재고')),
+                ('min_quantity', models.PositiveIntegerField(verbose_name='당시 안전 재고')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='발생 시각')),
+                ('processed_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='알림 처리 시각')),
+                ('variant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='inventory.productvariant', verbose_name='품목 규격')),
+            ],
+            options={
+                'verbose_name': '재고 부족 알림',
+                'verbose_name_plural': '재고 부족 알림',
+            },
+        ),
+        migrations.RunPython(fill_is_low, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0019_productvariant_is_low_lowstockevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='일자')),
+                ('quantity', models.PositiveIntegerField(verbose_name='마감 재고')),
+                ('variant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='inventory.productvariant', verbose_name='품목 규격')),
+            ],
+            options={
+                'verbose_name': '재고 스냅샷',
+                'verbose_name_plural': '재고 스냅샷',
+                'unique_together': {('date', 'variant')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0020_stocksnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VariantForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('avg_daily', models.FloatField(default=0, verbose_name='일평균 소모 (이동평균)')),
+                ('ewma_daily', models.FloatField(default=0, verbose_name='일평균 소모 (지수가중)')),
+                ('days_of_cover', models.FloatField(blank=True, help_text='소모 기록이 없으면 비움', null=True, verbose_name='재고 소진 예상 일수')),
+                ('reorder_point', models.PositiveIntegerField(default=0, verbose_name='권장 발주점')),
+                ('computed_at', models.DateTimeField(verbose_name='계산 시각')),
+                ('variant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='forecast', to='inventory.productvariant', verbose_name='품목 규격')),
+            ],
+            options={
+                'verbose_name': '소모 예측',
+                'verbose_name_plural': '소모 예측',
+            },
+        ),
+    ]
@@ -1,5 +1,9 @@
+import operator
 import re
-from django.db import models
+from collections import Counter
+from functools import reduce
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
 from django.utils import timezone
 
 # 🔹 사용처 (카테고리)
@@ -29,11 +33,25 @@ class Item(models.Model):
 # 🔹 규격
 class Spec(models.Model):
     label = models.CharField("규격 라벨", max_length=100)
+    sort_key = models.PositiveBigIntegerField("정렬 숫자", default=0, editable=False, help_text="라벨의 첫 숫자 (자연 정렬용)")
+    unit = models.CharField("단위", max_length=20, blank=True, editable=False)
 
     def __str__(self):
         return self.label
 
+    def set_sort_key(self):
+        """라벨에서 정렬 숫자/단위 계산 (저장은 하지 않음)"""
+        self.sort_key, self.unit = parse_spec_label(self.label)
+
+    def save(self, *args, **kwargs):
+        self.set_sort_key()
+        super().save(*args, **kwargs)
+
     class Meta:
+        ordering = ['sort_key', 'label']
+        indexes = [
+            models.Index(fields=['sort_key', 'label'], name='spec_sort_idx'),
+        ]
         verbose_name = "규격"
         verbose_name_plural = "규격"
 
@@ -45,33 +63,47 @@ class ProductVariant(models.Model):
 
     current_quantity = models.PositiveIntegerField("현재 재고", default=0)
     min_quantity = models.PositiveIntegerField("안전 재고", default=0, help_text="재고 부족 경고 기준 수량")
+    is_low = models.BooleanField("재고 부족", default=False, db_index=True, editable=False,
+                                 help_text="현재 재고 < 안전 재고 (재고 변경 시 갱신)")
     unit_price = models.PositiveIntegerField("단가", default=0, help_text="이 품목+규격의 단가(원)")
 
+    search_name = models.CharField("검색용 이름", max_length=200, blank=True, db_index=True, editable=False)
+    search_initials = models.CharField("검색용 초성", max_length=200, blank=True, db_index=True, editable=False)
+
     def __str__(self):
         return f"{self.item.name} [{self.spec.label}]"
 
+    def set_search_keys(self, item_name=None, spec_label=None):
+        """품목명 + 규격 라벨로 자동완성용 검색 키 계산 (저장은 하지 않음)"""
+        text = f"{item_name or self.item.name}{spec_label or self.spec.label}"
+        self.search_name = normalize_search_text(text)
+        self.search_initials = extract_chosung(text)
+
     def save(self, *args, **kwargs):
         if not self.code:
-            item_initials = extract_initials(self.item.name)
-            spec_digits = extract_spec_number(self.spec.label)
-            base = f"{item_initials}{spec_digits or '00'}"
-
-            suffix = 1
-            while True:
-                candidate = f"{base}-{suffix:03d}"
-                if not ProductVariant.objects.filter(code=candidate).exists():
-                    self.code = candidate
-                    break
-                suffix += 1
+            self.code = allocate_code(code_prefix(self.item.name, self.spec.label))
+        self.set_search_keys()
 
         super().save(*args, **kwargs)
 
     class Meta:
         unique_together = ('item', 'spec')
-        ordering = ['item__name', 'spec__label']
+        ordering = ['item__name', 'spec__sort_key', 'spec__label']
         verbose_name = "품목 규격"
         verbose_name_plural = "품목 규격"
 
+# 🔹 품목 코드 일련번호 (접두어별)
+class CodeSequence(models.Model):
+    prefix = models.CharField("코드 접두어", max_length=20, unique=True)
+    last_value = models.PositiveIntegerField("마지막 번호", default=0)
+
+    def __str__(self):
+        return f"{self.prefix}-{self.last_value:03d}"
+
+    class Meta:
+        verbose_name = "품목 코드 일련번호"
+        verbose_name_plural = "품목 코드 일련번호"
+
 # 🔹 사용자
 class InventoryUser(models.Model):
     name = models.CharField("이름", max_length=100)
@@ -101,14 +133,108 @@ class InventoryLog(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['type', 'timestamp'], name='invlog_type_ts_idx'),
+            models.Index(fields=['variant', 'timestamp'], name='invlog_variant_ts_idx'),
+            models.Index(fields=['user', 'timestamp'], name='invlog_user_ts_idx'),
+        ]
         verbose_name = "입출고 기록"
         verbose_name_plural = "입출고 기록"
 
+# 🔹 일별 사용 집계 (InventoryLog 롤업)
+class DailyUsage(models.Model):
+    date = models.DateField("일자")
+    variant = models.ForeignKey(ProductVariant, verbose_name="품목 규격", on_delete=models.CASCADE)
+    user = models.ForeignKey(InventoryUser, verbose_name="담당자", on_delete=models.SET_NULL, null=True, blank=True)
+    type = models.CharField("입출고 구분", max_length=3, choices=InventoryLog.LOG_TYPE)
+    quantity = models.IntegerField("수량", default=0)
+
+    def __str__(self):
+        return f"{self.date} [{self.get_type_display()}] {self.variant} - {self.quantity}"
+
+    class Meta:
+        # 같은 키의 행이 중복되어도 항상 Sum 으로 읽으므로 고유 제약은 두지 않음
+        indexes = [
+            models.Index(fields=['type', 'date'], name='dailyusage_type_date_idx'),
+            models.Index(fields=['date', 'variant', 'user', 'type'], name='dailyusage_key_idx'),
+        ]
+        verbose_name = "일별 사용 집계"
+        verbose_name_plural = "일별 사용 집계"
+
+# 🔹 품목규격별 소모 예측 (forecast_inventory 명령으로 일괄 계산)
+class VariantForecast(models.Model):
+    variant = models.OneToOneField(ProductVariant, verbose_name="품목 규격", on_delete=models.CASCADE, related_name='forecast')
+    avg_daily = models.FloatField("일평균 소모 (이동평균)", default=0)
+    ewma_daily = models.FloatField("일평균 소모 (지수가중)", default=0)
+    days_of_cover = models.FloatField("재고 소진 예상 일수", null=True, blank=True, help_text="소모 기록이 없으면 비움")
+    reorder_point = models.PositiveIntegerField("권장 발주점", default=0)
+    computed_at = models.DateTimeField("계산 시각")
+
+    def __str__(self):
+        return f"{self.variant} 일 {self.ewma_daily:.1f} / 발주점 {self.reorder_point}"
+
+    class Meta:
+        verbose_name = "소모 예측"
+        verbose_name_plural = "소모 예측"
+
+# 🔹 일자별 재고 스냅샷 (해당 일자 마감 기준)
+class StockSnapshot(models.Model):
+    date = models.DateField("일자")
+    variant = models.ForeignKey(ProductVariant, verbose_name="품목 규격", on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField("마감 재고")
+
+    def __str__(self):
+        return f"{self.date} {self.variant} - {self.quantity}"
+
+    class Meta:
+        unique_together = ('date', 'variant')
+        verbose_name = "재고 스냅샷"
+        verbose_name_plural = "재고 스냅샷"
+
+# 🔹 재고 부족 상태 변경 기록 (알림 대기열)
+class LowStockEvent(models.Model):
+    variant = models.ForeignKey(ProductVariant, verbose_name="품목 규격", on_delete=models.CASCADE)
+    is_low = models.BooleanField("재고 부족", help_text="True = 부족 진입, False = 부족 해소")
+    quantity = models.PositiveIntegerField("당시 재고")
+    min_quantity = models.PositiveIntegerField("당시 안전 재고")
+    created_at = models.DateTimeField("발생 시각", auto_now_add=True)
+    processed_at = models.DateTimeField("알림 처리 시각", null=True, blank=True, db_index=True)
+
+    def __str__(self):
+        state = "부족" if self.is_low else "해소"
+        return f"{self.variant} {state} ({self.quantity}/{self.min_quantity})"
+
+    class Meta:
+        verbose_name = "재고 부족 알림"
+        verbose_name_plural = "재고 부족 알림"
+
+# 🔹 검색 색인 (품목명/설명/규격 라벨의 1·2글자 조각)
+class SearchToken(models.Model):
+    KIND = (
+        ('item', '품목'),
+        ('spec', '규격'),
+    )
+    kind = models.CharField("대상", max_length=4, choices=KIND)
+    object_id = models.BigIntegerField("대상 ID")
+    field = models.CharField("필드", max_length=20)
+    token = models.CharField("조각", max_length=2)
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.field} '{self.token}'"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'token', 'object_id'], name='searchtoken_lookup_idx'),
+            models.Index(fields=['kind', 'object_id'], name='searchtoken_object_idx'),
+        ]
+        verbose_name = "검색 색인"
+        verbose_name_plural = "검색 색인"
+
 # 🔹 입고 대기 건
 class PendingStockBatch(models.Model):
     supplier = models.CharField("거래처", max_length=100)
     uploaded_at = models.DateTimeField("입고 예정일")  
-    status = models.CharField("상태", max_length=10, choices=[('PENDING', '대기'), ('DONE', '완료'), ('CANCELED', '취소')], default='PENDING')
+    status = models.CharField("상태", max_length=10, choices=[('PENDING', '대기'), ('PROCESSING', '처리중'), ('DONE', '완료'), ('CANCELED', '취소')], default='PENDING')
     processed_by = models.ForeignKey(InventoryUser, verbose_name="처리자", null=True, blank=True, on_delete=models.SET_NULL)
     processed_at = models.DateTimeField("처리일시", null=True, blank=True)
 
@@ -146,3 +272,101 @@ def extract_initials(name):
 def extract_spec_number(spec):
     digits = re.sub(r'[^0-9]', '', spec)
     return digits if digits else '00'  # 숫자가 없으면 '00' 반환
+
+# 🔹 규격 정렬 유틸 함수
+SPEC_NUMBER_RE = re.compile(r'(\d+)\s*([^\d\s]*)')
+SPEC_SORT_KEY_MAX = 2 ** 63 - 1
+
+def parse_spec_label(label):
+    """'100 ml' → (100, 'ml'), 'L' → (0, '') — 첫 숫자와 바로 뒤 단위"""
+    match = SPEC_NUMBER_RE.search(label or '')
+    if not match:
+        return 0, ''
+    return min(int(match.group(1)), SPEC_SORT_KEY_MAX), match.group(2)[:20]
+
+# 🔹 검색 키 유틸 함수
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+
+def normalize_search_text(text):
+    """소문자 + 공백 제거"""
+    return re.sub(r'\s+', '', (text or '').lower())
+
+def extract_chosung(text):
+    """'면장갑 L' → 'ㅁㅈㄱl' (한글 음절은 초성으로, 나머지는 정규화한 글자 그대로)"""
+    result = []
+    for ch in normalize_search_text(text):
+        code = ord(ch) - 0xAC00
+        result.append(CHOSUNG[code // 588] if 0 <= code < 11172 else ch)
+    return ''.join(result)
+
+def code_prefix(item_name, spec_label):
+    return f"{extract_initials(item_name)}{extract_spec_number(spec_label)}"
+
+def split_code(code):
+    """'장갑10-003' → ('장갑10', 3), 형식이 다르면 None"""
+    match = re.match(r'^(.+)-(\d+)$', code or '')
+    return (match.group(1), int(match.group(2))) if match else None
+
+# 한 쿼리에 넣는 접두어 수 (SQLite 의 식 깊이/바인드 변수 한도 이하로 유지)
+CODE_PREFIX_CHUNK = 200
+
+def _chunked(values, size=CODE_PREFIX_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def _max_code_suffixes(prefixes):
+    """접두어 목록 → {접두어: 기존 코드의 최대 번호} (접두어 CODE_PREFIX_CHUNK 개당 조회 1회, 코드가 없으면 0)"""
+    result = dict.fromkeys(prefixes, 0)
+    for chunk in _chunked(result):
+        condition = reduce(operator.or_, (Q(code__startswith=f"{prefix}-") for prefix in chunk))
+        for code in ProductVariant.objects.filter(condition).order_by().values_list('code', flat=True):
+            parsed = split_code(code)
+            if parsed and parsed[0] in result:
+                result[parsed[0]] = max(result[parsed[0]], parsed[1])
+    return result
+
+def allocate_codes(prefixes):
+    """
+    접두어 목록 → 같은 순서의 품목 코드 목록 (접두어별 일련번호 테이블에서 한 번에 예약)
+    번호는 F() 증가 UPDATE 로 예약하므로 동시 요청끼리 같은 번호를 받지 않음
+    접두어 CODE_PREFIX_CHUNK 개당 조회 1회 + 증가 1회 + 재조회 1회 (새 접두어가 있으면 기존 코드 조회/생성 추가)
+    예약된 번호는 저장 실패 시에도 재사용하지 않음 (중간 번호가 비어도 중복은 없음)
+    """
+    counts = Counter(prefixes)
+    if not counts:
+        return []
+
+    with transaction.atomic():
+        existing = set()
+        for chunk in _chunked(counts):
+            existing.update(CodeSequence.objects.filter(prefix__in=chunk).values_list('prefix', flat=True))
+        missing = [prefix for prefix in counts if prefix not in existing]
+        if missing:
+            # 일련번호 행이 없으면 기존 코드의 최대 번호에서 시작 (다른 요청이 먼저 만든 행은 그대로 둠)
+            starts = _max_code_suffixes(missing)
+            CodeSequence.objects.bulk_create(
+                [CodeSequence(prefix=prefix, last_value=starts[prefix]) for prefix in missing],
+                ignore_conflicts=True,
+            )
+
+        last_values = {}
+        for chunk in _chunked(counts):
+            increment = Case(
+                *(When(prefix=prefix, then=Value(counts[prefix])) for prefix in chunk),
+                output_field=models.PositiveIntegerField(),
+            )
+            sequences = CodeSequence.objects.filter(prefix__in=chunk)
+            sequences.update(last_value=F('last_value') + increment)
+            # 증가 이후에는 행이 잠겨 있으므로 읽은 값은 이 트랜잭션이 예약한 범위의 끝
+            last_values.update(sequences.values_list('prefix', 'last_value'))
+
+    next_values = {prefix: last_values[prefix] - n for prefix, n in counts.items()}
+    codes = []
+    for prefix in prefixes:
+        next_values[prefix] += 1
+        codes.append(f"{prefix}-{next_values[prefix]:03d}")
+    return codes
+
+def allocate_code(prefix):
+    return allocate_codes([prefix])[0]
@@ -0,0 +1,72 @@
+# inventory/services/alerts.py
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from inventory.models import LowStockEvent, ProductVariant
+
+# is_low 가 실제 재고 상태와 다른 품목규격
+STALE_LOW_FLAG = (
+    Q(is_low=False, current_quantity__lt=F('min_quantity')) |
+    Q(is_low=True, current_quantity__gte=F('min_quantity'))
+)
+
+
+def _events(variants):
+    return [
+        LowStockEvent(variant_id=v.id, is_low=v.is_low, quantity=v.current_quantity, min_quantity=v.min_quantity)
+        for v in variants
+    ]
+
+def queue_low_stock_events(variants, previous):
+    """
+    is_low 가 이전 값과 달라진 품목규격을 알림 대기열에 추가 — 호출하는 쪽 트랜잭션 안에서 실행
+    variants: is_low/current_quantity 가 새 값인 ProductVariant 목록
+    previous: {variant_id: 변경 전 is_low}
+    """
+    changed = [variant for variant in variants if variant.is_low != previous[variant.id]]
+    if changed:
+        LowStockEvent.objects.bulk_create(_events(changed))
+    return changed
+
+def sync_low_stock(variant_ids):
+    """
+    메모리에 새 재고가 없는 경로(조건부 UPDATE, 관리자 수정 등)용
+    상태가 어긋난 품목만 조회해 is_low 갱신 + 알림 추가 (평소에는 조회 1회)
+    """
+    stale = list(
+        ProductVariant.objects.filter(STALE_LOW_FLAG, id__in=variant_ids)
+        .only('id', 'is_low', 'current_quantity', 'min_quantity').order_by()
+    )
+    for variant in stale:
+        variant.is_low = not variant.is_low
+    if stale:
+        ProductVariant.objects.bulk_update(stale, ['is_low'])
+        LowStockEvent.objects.bulk_create(_events(stale))
+    return stale
+
+@transaction.atomic
+def drain_low_stock_events(mark_processed=True):
+    """
+    처리되지 않은 재고 부족 알림을 품목규격별 마지막 상태로 묶어 반환하고 처리 완료로 표시
+    반환: [{'variant', 'is_low', 'quantity', 'min_quantity', 'changes', 'last_at'}, ...] (부족 품목 먼저)
+    """
+    events = list(
+        LowStockEvent.objects.select_for_update(of=('self',))
+        .filter(processed_at__isnull=True)
+        .select_related('variant__item', 'variant__spec')
+        .order_by('id')
+    )
+    digest = {}
+    for event in events:
+        row = digest.setdefault(event.variant_id, {'variant': event.variant, 'changes': 0})
+        row.update(
+            is_low=event.is_low,
+            quantity=event.quantity,
+            min_quantity=event.min_quantity,
+            last_at=event.created_at,
+        )
+        row['changes'] += 1
+    if mark_processed and events:
+        LowStockEvent.objects.filter(id__in=[event.id for event in events]).update(processed_at=now())
+    return sorted(digest.values(), key=lambda r: (not r['is_low'], str(r['variant'])))
@@ -0,0 +1,123 @@
+# inventory/services/catalog.py
+from django.core.cache import cache
+from django.db import transaction
+
+from inventory.models import Item, ProductVariant, Spec, allocate_codes, code_prefix
+from inventory.services.search import index_specs
+from inventory.utils import build_variant_map
+
+CATALOG_VERSION_KEY = 'inventory:catalog:version'
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 1)
+    return version
+
+def _increment_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, 2, timeout=None)
+
+def bump_catalog_version(**kwargs):
+    """
+    품목/규격/품목규격/사용처 변경 시 호출 (signals) — 이전 버전 캐시는 TTL 로 자연 소멸
+    커밋 이후에 올려야 다른 요청이 커밋 전 데이터로 새 버전을 채우지 않음
+    """
+    transaction.on_commit(_increment_catalog_version)
+
+def _catalog_variants(category_id=None):
+    variants = ProductVariant.objects.all()
+    if category_id:
+        variants = variants.filter(item__category_id=category_id)
+    return variants
+
+def _build_catalog(category_id=None):
+    variants = list(
+        _catalog_variants(category_id)
+        .select_related('item', 'spec')
+        .order_by('item__name', 'spec__sort_key', 'spec__label')
+    )
+    items = {}
+    for variant in variants:
+        item = variant.item
+        items.setdefault(item.id, {
+            'id': item.id,
+            'name': item.name,
+            'description': item.description,
+            'category_id': item.category_id,
+        })
+    return {
+        'items': sorted(items.values(), key=lambda i: i['name']),
+        'variant_map': build_variant_map(variants),
+    }
+
+def get_catalog(category_id=None):
+    """
+    키오스크/입고 화면용 품목 카탈로그 (구조는 캐시, 재고 수량만 매번 조회)
+    반환: {'items': [...], 'variant_map': {item_id: [{'id', 'spec_label', 'stock'}, ...]}}
+    """
+    key = f"inventory:catalog:{get_catalog_version()}:{category_id or 'all'}"
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = _build_catalog(category_id)
+        cache.set(key, catalog, timeout=CATALOG_TIMEOUT)
+
+    quantities = dict(_catalog_variants(category_id).order_by().values_list('id', 'current_quantity'))
+    for v_list in catalog['variant_map'].values():
+        for v in v_list:
+            v['stock'] = quantities.get(v['id'], v['stock'])
+    return catalog
+
+@transaction.atomic
+def register_item(name, category_id, spec_labels):
+    """
+    품목 + 여러 규격 일괄 등록 (이미 연결된 규격은 건너뜀)
+    규격 조회 1회, 없는 규격 bulk_create, 코드 일괄 예약, 품목규격 bulk_create 1회
+    반환: (item, 새로 만든 ProductVariant 목록)
+    """
+    item, _ = Item.objects.get_or_create(
+        name=name,
+        category_id=category_id,
+        defaults={'description': None}
+    )
+    existing_labels = set(
+        ProductVariant.objects.filter(item=item).order_by().values_list('spec__label', flat=True)
+    )
+    labels = list(dict.fromkeys(
+        label for label in (s.strip() for s in spec_labels) if label and label not in existing_labels
+    ))
+    if not labels:
+        return item, []
+
+    specs = {}
+    for spec in Spec.objects.filter(label__in=labels).order_by('id'):
+        specs.setdefault(spec.label, spec)
+    missing = [Spec(label=label) for label in labels if label not in specs]
+    if missing:
+        for spec in missing:
+            spec.set_sort_key()
+        Spec.objects.bulk_create(missing)
+        if any(spec.pk is None for spec in missing):
+            # bulk_create 가 pk 를 돌려주지 않는 DB
+            missing = Spec.objects.filter(label__in=[spec.label for spec in missing]).order_by('id')
+        for spec in missing:
+            specs.setdefault(spec.label, spec)
+        index_specs(missing)
+
+    codes = allocate_codes([code_prefix(item.name, label) for label in labels])
+    variants = [
+        ProductVariant(item=item, spec=specs[label], code=code, current_quantity=0, min_quantity=0)
+        for label, code in zip(labels, codes)
+    ]
+    # bulk_create 는 save() 를 거치지 않으므로 검색 키를 직접 계산
+    for variant, label in zip(variants, labels):
+        variant.set_search_keys(item.name, label)
+    variants = ProductVariant.objects.bulk_create(variants)
+    # bulk_create 는 post_save 시그널을 보내지 않으므로 직접 캐시 버전 증가
+    bump_catalog_version()
+    return item, variants
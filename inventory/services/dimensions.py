@@ -0,0 +1,56 @@
+# inventory/services/dimensions.py
+import threading
+import time
+
+from django.db import transaction
+
+from inventory.models import InventoryUser, UsageCategory
+
+# 사용처/사용자는 거의 바뀌지 않으므로 프로세스 메모리에 보관
+# 같은 프로세스의 변경은 signals 에서 즉시 비우고, 다른 프로세스의 변경은 TTL 이 지나면 반영
+DIMENSION_TTL = 60 * 5
+SYSTEM_USER_NAME = "system"
+
+_cache = {}
+_lock = threading.Lock()
+_generation = 0
+
+
+def _cached(key, loader):
+    entry = _cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    generation = _generation
+    value = loader()
+    with _lock:
+        # 조회 도중 캐시가 비워졌다면 이전 데이터일 수 있으므로 저장하지 않음
+        if generation == _generation:
+            _cache[key] = (time.monotonic() + DIMENSION_TTL, value)
+    return value
+
+def _clear():
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
+
+def clear_dimension_cache(**kwargs):
+    """
+    UsageCategory / InventoryUser 변경 시 호출 (signals)
+    커밋 전에 다른 요청이 이전 데이터로 다시 채울 수 있으므로 커밋 후 한 번 더 비움
+    """
+    _clear()
+    transaction.on_commit(_clear)
+
+def get_categories():
+    return _cached('categories', lambda: list(UsageCategory.objects.all()))
+
+def get_users(include_system=False):
+    users = _cached('users', lambda: list(InventoryUser.objects.all()))
+    if include_system:
+        return users
+    return [user for user in users if user.name != SYSTEM_USER_NAME]
+
+def get_system_user():
+    """입고 대기건 처리 등에 쓰는 system 사용자 (없으면 생성)"""
+    return _cached('system_user', lambda: InventoryUser.objects.get_or_create(name=SYSTEM_USER_NAME)[0])
@@ -0,0 +1,112 @@
+# inventory/services/forecast.py
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from inventory.models import DailyUsage, ProductVariant, VariantForecast
+
+HISTORY_DAYS = 730      # 소모 기록 조회 기간
+WINDOW_DAYS = 28        # 이동평균/표준편차 기간
+EWMA_SPAN = 14          # 지수가중 평균 기간 (alpha = 2 / (span + 1))
+LEAD_TIME_DAYS = 7      # 발주 후 입고까지 걸리는 일수
+SERVICE_Z = 1.65        # 안전 재고 계수 (약 95% 서비스 수준)
+
+
+def usage_matrix(start, end):
+    """
+    일별 집계에서 소모(OUT) 수량을 품목규격 × 일자 밀집 행렬로 조회 (start <= 일자 < end)
+    반환: (variant_ids 배열, 행렬[len(variant_ids), 일수])
+    """
+    variant_ids = np.fromiter(
+        ProductVariant.objects.order_by('id').values_list('id', flat=True), dtype=np.int64
+    )
+    days = (end - start).days
+    matrix = np.zeros((len(variant_ids), days), dtype=np.float64)
+    rows = (
+        DailyUsage.objects.filter(type='OUT', date__gte=start, date__lt=end)
+        .values('variant_id', 'date')
+        .annotate(total=Sum('quantity'))
+        .order_by()
+        .values_list('variant_id', 'date', 'total')
+    )
+    data = np.array(
+        [(variant_id, (date - start).days, total) for variant_id, date, total in rows.iterator(chunk_size=5000)],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    if len(data) and len(variant_ids):
+        row_idx = np.searchsorted(variant_ids, data[:, 0])
+        known = (row_idx < len(variant_ids)) & (variant_ids[np.minimum(row_idx, len(variant_ids) - 1)] == data[:, 0])
+        np.add.at(matrix, (row_idx[known], data[known, 1]), data[known, 2])
+    return variant_ids, matrix
+
+def compute_forecast(matrix, quantities, window=WINDOW_DAYS, span=EWMA_SPAN,
+                     lead_time=LEAD_TIME_DAYS, z=SERVICE_Z):
+    """
+    소모 행렬(품목규격 × 일자, 마지막 열이 가장 최근)과 현재 재고 배열로 예측값을 한 번에 계산
+    반환: dict of 배열 — avg_daily, ewma_daily, days_of_cover(NaN = 소모 없음), reorder_point
+    """
+    recent = matrix[:, -window:]
+    avg_daily = recent.mean(axis=1) if recent.shape[1] else np.zeros(len(matrix))
+    std_daily = recent.std(axis=1) if recent.shape[1] else np.zeros(len(matrix))
+
+    alpha = 2 / (span + 1)
+    weights = (1 - alpha) ** np.arange(matrix.shape[1] - 1, -1, -1)
+    ewma_daily = matrix @ weights / weights.sum() if matrix.shape[1] else np.zeros(len(matrix))
+
+    rate = np.maximum(avg_daily, ewma_daily)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_of_cover = np.where(rate > 0, quantities / rate, np.nan)
+    reorder_point = np.ceil(rate * lead_time + z * std_daily * math.sqrt(lead_time))
+    return {
+        'avg_daily': avg_daily,
+        'ewma_daily': ewma_daily,
+        'days_of_cover': days_of_cover,
+        'reorder_point': reorder_point.astype(np.int64),
+    }
+
+@transaction.atomic
+def refresh_forecasts(history_days=HISTORY_DAYS, **params):
+    """
+    전체 품목규격의 소모 예측을 다시 계산해 VariantForecast 에 저장 (오늘은 마감 전이므로 제외)
+    반환: 저장한 행 수
+    """
+    end = timezone.localdate()
+    start = end - timedelta(days=history_days)
+    variant_ids, matrix = usage_matrix(start, end)
+    if not len(variant_ids):
+        return 0
+
+    current = dict(ProductVariant.objects.order_by().values_list('id', 'current_quantity'))
+    quantities = np.array([current.get(variant_id, 0) for variant_id in variant_ids.tolist()], dtype=np.float64)
+    result = compute_forecast(matrix, quantities, **params)
+
+    computed_at = timezone.now()
+    forecasts = [
+        VariantForecast(
+            variant_id=variant_id,
+            avg_daily=round(avg, 2),
+            ewma_daily=round(ewma, 2),
+            days_of_cover=None if math.isnan(cover) else round(cover, 1),
+            reorder_point=reorder,
+            computed_at=computed_at,
+        )
+        for variant_id, avg, ewma, cover, reorder in zip(
+            variant_ids.tolist(),
+            result['avg_daily'].tolist(),
+            result['ewma_daily'].tolist(),
+            result['days_of_cover'].tolist(),
+            result['reorder_point'].tolist(),
+        )
+    ]
+    VariantForecast.objects.bulk_create(
+        forecasts,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['variant'],
+        update_fields=['avg_daily', 'ewma_daily', 'days_of_cover', 'reorder_point', 'computed_at'],
+    )
+    return len(forecasts)
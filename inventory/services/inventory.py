@@ -1,33 +1,140 @@
 # inventory/services/inventory.py
+from collections import defaultdict
+
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
 from inventory.models import ProductVariant, InventoryLog, InventoryUser
+from inventory.services.alerts import queue_low_stock_events, sync_low_stock
+from inventory.services.rollup import record_daily_usage
+from inventory.services.snapshots import shift_snapshots
+from inventory.utils import safe_int
 
-def process_stock_in(variant: ProductVariant, quantity: int, user: InventoryUser = None):
-    if quantity <= 0:
-        raise ValidationError("입고 수량은 1 이상이어야 합니다.")
-
-    variant.current_quantity += quantity
-    variant.save()
 
-    InventoryLog.objects.create(
-        user=user,
-        variant=variant,
-        quantity=quantity,
-        type='IN'
+def _increase_quantity(variant_id: int, quantity: int) -> bool:
+    """
+    current_quantity = current_quantity + n (DB 에서 원자적으로 갱신)
+    변경된 행이 없으면(품목 삭제 등) False
+    """
+    updated = ProductVariant.objects.filter(id=variant_id).update(
+        current_quantity=F('current_quantity') + quantity
     )
+    return updated == 1
 
-def process_stock_out(variant: ProductVariant, quantity: int, user: InventoryUser):
-    if quantity <= 0:
-        raise ValidationError("소모 수량은 1 이상이어야 합니다.")
-    if quantity > variant.current_quantity:
-        raise ValidationError(f"{variant} 재고 부족")
+@transaction.atomic
+def cancel_stock_out(log: InventoryLog):
+    """
+    소모 기록 취소: 수량 복원과 기록 삭제를 하나의 트랜잭션으로 처리
+    기록 일자 이후에 저장된 스냅샷에도 복원 수량을 더함
+    품목이 삭제되어 복원할 수 없으면 ValidationError
+    """
+    if not _increase_quantity(log.variant_id, log.quantity):
+        raise ValidationError("취소할 기록의 품목을 찾을 수 없습니다.")
+    record_daily_usage([log], sign=-1)
+    shift_snapshots(log.variant_id, timezone.localdate(log.timestamp), log.quantity)
+    sync_low_stock([log.variant_id])
+    log.delete()
 
-    variant.current_quantity -= quantity
-    variant.save()
+def parse_stock_entries(entries):
+    """
+    [{'id': id, 'qty': qty}, ...] → ([(variant_id, qty), ...], 행별 오류 메시지)
+    """
+    if not isinstance(entries, list):
+        return [], ["잘못된 항목 형식입니다."]
+    lines, errors = [], []
+    for idx, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            errors.append(f"{idx}행: 잘못된 항목 형식입니다.")
+            continue
+        variant_id, qty = entry.get('id'), entry.get('qty')
+        if not variant_id or not qty:
+            errors.append(f"{idx}행: 항목 정보가 부족합니다.")
+            continue
+        variant_id, err = safe_int(variant_id, f"{idx}행: 유효하지 않은 품목입니다.")
+        if err:
+            errors.append(err)
+            continue
+        qty, err = safe_int(qty, f"{idx}행: 유효하지 않은 수량입니다.")
+        if err:
+            errors.append(err)
+            continue
+        if qty <= 0:
+            errors.append(f"{idx}행: 수량은 1 이상이어야 합니다.")
+            continue
+        lines.append((variant_id, qty))
+    return lines, errors
 
-    InventoryLog.objects.create(
-        user=user,
-        variant=variant,
-        quantity=quantity,
-        type='OUT'
-    )
+def apply_stock_movements(lines, log_type: str, user: InventoryUser = None):
+    """
+    여러 품목의 입출고를 하나의 트랜잭션으로 처리 (전부 반영 또는 전부 취소)
+    lines: [(variant_id, qty), ...]  — 같은 품목이 여러 번 나와도 됨
+    log_type: 'IN' / 'OUT'
+    조회 1회(in_bulk) + bulk_update 1회 + bulk_create 1회 (+ 일별 집계, 재고 부족 알림 반영)
+    검증 실패 시 ValidationError(메시지 리스트)
+    """
+    totals = defaultdict(int)
+    for variant_id, qty in lines:
+        totals[variant_id] += qty
+    sign = 1 if log_type == 'IN' else -1
+
+    with transaction.atomic():
+        variants = (
+            ProductVariant.objects.select_for_update(of=('self',))
+            .select_related('item', 'spec')
+            .in_bulk(list(totals))
+        )
+
+        errors = []
+        for idx, (variant_id, _qty) in enumerate(lines, start=1):
+            if variant_id not in variants:
+                errors.append(f"{idx}행: 품목을 찾을 수 없습니다. (ID {variant_id})")
+        if log_type == 'OUT':
+            for variant_id, total in totals.items():
+                variant = variants.get(variant_id)
+                if variant and total > variant.current_quantity:
+                    errors.append(f"{variant} 재고 부족 (현재 {variant.current_quantity}, 요청 {total})")
+        if errors:
+            raise ValidationError(errors)
+
+        # 증감분은 F() 로 넘겨 동시 변경분을 덮어쓰지 않도록 함
+        new_quantities = {}
+        previous_low = {}
+        for variant_id, total in totals.items():
+            variant = variants[variant_id]
+            new_quantities[variant_id] = variant.current_quantity + sign * total
+            previous_low[variant_id] = variant.is_low
+            variant.is_low = new_quantities[variant_id] < variant.min_quantity
+            variant.current_quantity = F('current_quantity') + sign * total
+        try:
+            ProductVariant.objects.bulk_update(variants.values(), ['current_quantity', 'is_low'])
+        except IntegrityError:
+            # 조회 이후 다른 요청이 먼저 소모해 재고가 음수가 되는 경우 (CHECK 제약)
+            raise ValidationError("재고 부족: 다른 요청과 동시에 처리되었습니다. 다시 시도해주세요.")
+        for variant_id, quantity in new_quantities.items():
+            variants[variant_id].current_quantity = quantity
+
+        logs = InventoryLog.objects.bulk_create([
+            InventoryLog(user=user, variant=variants[variant_id], quantity=qty, type=log_type)
+            for variant_id, qty in lines
+        ])
+        record_daily_usage(logs)
+        queue_low_stock_events(variants.values(), previous_low)
+        return logs
+
+def process_stock_batch(entries, log_type: str, user: InventoryUser = None):
+    """
+    입출고(배치) 처리 — 입력 검증 후 apply_stock_movements 로 일괄 반영
+    entries: [{'id': id, 'qty': qty}, ...]
+    반환: 오류 메시지 리스트 (비어 있으면 성공, 오류가 있으면 아무것도 반영되지 않음)
+    """
+    lines, errors = parse_stock_entries(entries)
+    if errors:
+        return errors
+    if not lines:
+        return ["입력 값이 누락되었습니다."]
+    try:
+        apply_stock_movements(lines, log_type, user)
+    except ValidationError as ve:
+        return ve.messages
+    return []
@@ -0,0 +1,164 @@
+# inventory/services/pending.py
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.timezone import now
+
+from inventory.models import PendingStockBatch, PendingStockItem, ProductVariant, InventoryUser
+from inventory.services.inventory import apply_stock_movements
+
+
+def resolve_variant_ids(entries):
+    """
+    입고 대기 품목들의 (item_id, spec_id) → ProductVariant id (한 번의 쿼리)
+    """
+    pairs = {(entry.item_id, entry.spec_id) for entry in entries}
+    if not pairs:
+        return {}
+    rows = ProductVariant.objects.filter(
+        item_id__in={item_id for item_id, _ in pairs},
+        spec_id__in={spec_id for _, spec_id in pairs},
+    ).order_by().values_list('item_id', 'spec_id', 'id')
+    return {(item_id, spec_id): variant_id for item_id, spec_id, variant_id in rows if (item_id, spec_id) in pairs}
+
+def _missing_message(entry):
+    return f"{entry.item.name} - {entry.spec.label}: 품목 규격이 없어 입고하지 못했습니다."
+
+def receive_pending_entries(entries, update_map, user: InventoryUser = None):
+    """
+    입고 대기 품목 일괄 입고 — 호출하는 쪽 트랜잭션 안에서 실행
+    entries: PendingStockItem 목록 (item, spec select_related 권장)
+    update_map: {entry_id: 입고 수량} — 포함되지 않은 품목은 입고하지 않음
+    수량 수정 bulk_update 1회 + 품목규격 조회 1회 + apply_stock_movements
+    반환: 품목규격이 없어 입고하지 못한 PendingStockItem 리스트
+    """
+    targets = [entry for entry in entries if update_map.get(entry.id)]
+    changed = [entry for entry in targets if entry.quantity != update_map[entry.id]]
+    for entry in changed:
+        entry.quantity = update_map[entry.id]
+    if changed:
+        PendingStockItem.objects.bulk_update(changed, ['quantity'])
+
+    variant_ids = resolve_variant_ids(targets)
+    lines, missing = [], []
+    for entry in targets:
+        variant_id = variant_ids.get((entry.item_id, entry.spec_id))
+        if variant_id is None:
+            missing.append(entry)
+            continue
+        lines.append((variant_id, entry.quantity))
+
+    if lines:
+        apply_stock_movements(lines, 'IN', user)
+    return missing
+
+@transaction.atomic
+def update_batch_quantities(batch_id, update_map):
+    """
+    입고 대기건 수량 일괄 수정 — 전체 검증 후 bulk_update 1회 (실패 시 아무것도 반영하지 않음)
+    update_map: {entry_id: 수량} — 입고건의 모든 품목을 포함해야 함
+    반환: 실제로 수량이 바뀐 PendingStockItem 리스트
+    """
+    if not PendingStockBatch.objects.filter(id=batch_id, status='PENDING').exists():
+        raise ValidationError("대기 중인 입고건을 찾을 수 없습니다.")
+
+    entries = list(PendingStockItem.objects.filter(batch_id=batch_id).only('id', 'quantity'))
+    errors = []
+    entry_ids = {entry.id for entry in entries}
+    for entry in entries:
+        if entry.id not in update_map:
+            errors.append(f"ID {entry.id} 수량 누락")
+    unknown = set(update_map) - entry_ids
+    if unknown:
+        errors.append(f"입고건에 없는 항목입니다: {', '.join(map(str, sorted(unknown)))}")
+    if any(quantity <= 0 for quantity in update_map.values()):
+        errors.append('수량은 1 이상이어야 합니다.')
+    if errors:
+        raise ValidationError(errors)
+
+    changed = [entry for entry in entries if entry.quantity != update_map[entry.id]]
+    for entry in changed:
+        entry.quantity = update_map[entry.id]
+    if changed:
+        PendingStockItem.objects.bulk_update(changed, ['quantity'])
+    return changed
+
+def claim_pending_batches(batch_ids):
+    """
+    PENDING → PROCESSING 조건부 상태 변경으로 입고건 선점 — 호출하는 쪽 트랜잭션 안에서 실행
+    하나라도 선점하지 못하면(이미 처리/취소/다른 사람이 처리 중) ValidationError → 전체 롤백
+    """
+    claimed = PendingStockBatch.objects.filter(id__in=batch_ids, status='PENDING').update(status='PROCESSING')
+    if claimed != len(batch_ids):
+        processing = set(
+            PendingStockBatch.objects.filter(id__in=batch_ids, status='PROCESSING').values_list('id', flat=True)
+        )
+        unavailable = [str(batch_id) for batch_id in batch_ids if batch_id not in processing]
+        raise ValidationError(f"대기 상태가 아닌 입고건이 있습니다: {', '.join(unavailable)}")
+
+def _complete_batches(batch_ids, user):
+    PendingStockBatch.objects.filter(id__in=batch_ids, status='PROCESSING').update(
+        status='DONE', processed_at=now(), processed_by=user
+    )
+
+@transaction.atomic
+def receive_pending_batch(batch: PendingStockBatch, update_map, user: InventoryUser = None):
+    """
+    입고 대기건 처리 (선점 + 수량 반영 + 재고 입고 + 완료 처리)
+    update_map 의 id 가 모두 이 입고건의 품목이어야 함, 아니면 ValidationError
+    반환: 입고하지 못한 행 메시지 리스트
+    """
+    claim_pending_batches([batch.id])
+    entries = list(batch.items.select_related('item', 'spec'))
+    matched = [entry.id for entry in entries if entry.id in update_map]
+    if len(matched) != len(update_map):
+        raise ValidationError(
+            f'전송된 항목 수와 실제 항목 수가 일치하지 않습니다. (전송 {len(update_map)}건, 매칭된 {len(matched)}건)'
+        )
+
+    missing = receive_pending_entries(entries, update_map, user)
+    _complete_batches([batch.id], user)
+    return [_missing_message(entry) for entry in missing]
+
+@transaction.atomic
+def receive_pending_batches(batch_ids, overrides=None, user: InventoryUser = None):
+    """
+    여러 입고 대기건을 한 번에 입고 (하나의 트랜잭션, 하나의 일괄 재고 반영)
+    overrides: {entry_id: 수량} 선택적 수량 수정 (0 이면 해당 행 제외), 없으면 등록된 수량 그대로
+    반환: 입고건별 결과 [{'batch_id', 'supplier', 'lines', 'quantity', 'missing': [...]}, ...]
+    """
+    batch_ids = list(dict.fromkeys(batch_ids))
+    if not batch_ids:
+        raise ValidationError("처리할 입고건이 없습니다.")
+    overrides = overrides or {}
+    claim_pending_batches(batch_ids)
+
+    batches = PendingStockBatch.objects.in_bulk(batch_ids)
+    entries = list(PendingStockItem.objects.filter(batch_id__in=batch_ids).select_related('item', 'spec'))
+    unknown = set(overrides) - {entry.id for entry in entries}
+    if unknown:
+        raise ValidationError(f"선택한 입고건에 없는 항목입니다: {', '.join(map(str, sorted(unknown)))}")
+    if any(qty < 0 for qty in overrides.values()):
+        raise ValidationError("수량은 0 이상이어야 합니다.")
+
+    update_map = {entry.id: overrides.get(entry.id, entry.quantity) for entry in entries}
+    missing = {entry.id for entry in receive_pending_entries(entries, update_map, user)}
+    _complete_batches(batch_ids, user)
+
+    summary = {
+        batch_id: {
+            'batch_id': batch_id,
+            'supplier': batches[batch_id].supplier,
+            'lines': 0,
+            'quantity': 0,
+            'missing': [],
+        }
+        for batch_id in batch_ids
+    }
+    for entry in entries:
+        row = summary[entry.batch_id]
+        if entry.id in missing:
+            row['missing'].append(_missing_message(entry))
+        elif update_map[entry.id]:
+            row['lines'] += 1
+            row['quantity'] += update_map[entry.id]
+    return list(summary.values())
@@ -0,0 +1,73 @@
+# inventory/services/reconcile.py
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, When
+
+from inventory.models import InventoryLog, ProductVariant
+from inventory.services.alerts import sync_low_stock
+
+
+def ledger_balances(variant_ids=None):
+    """
+    입출고 기록 기준 품목규격별 재고 Σ(입고) - Σ(소모) — 그룹 집계 쿼리 1회
+    반환: {variant_id: 장부 재고} (기록이 없는 품목규격은 포함하지 않음)
+    """
+    logs = InventoryLog.objects.all()
+    if variant_ids is not None:
+        logs = logs.filter(variant_id__in=variant_ids)
+    rows = logs.values('variant_id').annotate(
+        balance=Sum(Case(
+            When(type='IN', then=F('quantity')),
+            default=-F('quantity'),
+            output_field=IntegerField(),
+        ))
+    ).order_by().values_list('variant_id', 'balance')
+    return dict(rows.iterator(chunk_size=5000))
+
+def find_drift():
+    """
+    현재 재고(current_quantity)와 장부 재고가 다른 품목규격 목록
+    반환: [{'variant_id', 'code', 'label', 'current', 'ledger', 'drift'}, ...] (차이가 큰 순)
+    """
+    balances = ledger_balances()
+    variants = ProductVariant.objects.order_by().values_list(
+        'id', 'code', 'item__name', 'spec__label', 'current_quantity'
+    )
+    report = []
+    for variant_id, code, item_name, spec_label, current in variants.iterator(chunk_size=5000):
+        ledger = balances.get(variant_id, 0)
+        if current != ledger:
+            report.append({
+                'variant_id': variant_id,
+                'code': code or '',
+                'label': f"{item_name} - {spec_label}",
+                'current': current,
+                'ledger': ledger,
+                'drift': current - ledger,
+            })
+    report.sort(key=lambda r: (-abs(r['drift']), r['label']))
+    return report
+
+@transaction.atomic
+def repair_drift(variant_ids):
+    """
+    선택한 품목규격의 현재 재고를 장부 재고로 맞춤 (잠근 뒤 다시 계산하므로 동시 입출고와 충돌하지 않음)
+    장부 재고가 음수면 0 으로 맞춤
+    반환: 수정한 품목규격 수
+    """
+    variants = list(
+        ProductVariant.objects.select_for_update()
+        .filter(id__in=variant_ids)
+        .order_by()
+        .only('id', 'current_quantity')
+    )
+    balances = ledger_balances([variant.id for variant in variants])
+    changed = []
+    for variant in variants:
+        ledger = max(balances.get(variant.id, 0), 0)
+        if variant.current_quantity != ledger:
+            variant.current_quantity = ledger
+            changed.append(variant)
+    if changed:
+        ProductVariant.objects.bulk_update(changed, ['current_quantity'], batch_size=500)
+        sync_low_stock([variant.id for variant in changed])
+    return len(changed)
@@ -0,0 +1,78 @@
+# inventory/services/rollup.py
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from inventory.models import DailyUsage, InventoryLog
+from inventory.utils import date_range_bounds, filter_date_range
+
+
+def record_daily_usage(logs, sign: int = 1):
+    """
+    입출고 기록을 일별 집계(DailyUsage)에 반영 — 호출하는 쪽 트랜잭션 안에서 실행
+    logs: InventoryLog 목록 (저장 전/후 무관, timestamp·variant_id·user_id·type·quantity 사용)
+    sign: 1 = 추가, -1 = 취소(삭제된 기록 차감)
+    """
+    deltas = defaultdict(int)
+    for log in logs:
+        key = (timezone.localdate(log.timestamp), log.variant_id, log.user_id, log.type)
+        deltas[key] += sign * log.quantity
+    if not deltas:
+        return
+
+    existing = {}
+    rows = DailyUsage.objects.filter(
+        date__in={key[0] for key in deltas},
+        variant_id__in={key[1] for key in deltas},
+    )
+    for row in rows:
+        existing.setdefault((row.date, row.variant_id, row.user_id, row.type), row)
+
+    to_update, to_create = [], []
+    for (date, variant_id, user_id, log_type), delta in deltas.items():
+        row = existing.get((date, variant_id, user_id, log_type))
+        if row:
+            row.quantity = F('quantity') + delta
+            to_update.append(row)
+        else:
+            to_create.append(DailyUsage(
+                date=date, variant_id=variant_id, user_id=user_id, type=log_type, quantity=delta
+            ))
+    if to_update:
+        DailyUsage.objects.bulk_update(to_update, ['quantity'])
+    if to_create:
+        DailyUsage.objects.bulk_create(to_create)
+
+@transaction.atomic
+def rebuild_daily_usage(start=None, end=None):
+    """
+    InventoryLog 에서 일별 집계를 다시 계산 (기간 미지정 시 전체)
+    반환: 생성된 집계 행 수
+    """
+    rollups = DailyUsage.objects.all()
+    lower, upper = date_range_bounds(start, end)
+    if lower:
+        rollups = rollups.filter(date__gte=timezone.localdate(lower))
+    if upper:
+        rollups = rollups.filter(date__lt=timezone.localdate(upper))
+    rollups.delete()
+
+    rows = (
+        filter_date_range(InventoryLog.objects.all(), start, end)
+        .annotate(day=TruncDate('timestamp'))
+        .values('day', 'variant_id', 'user_id', 'type')
+        .annotate(total=Sum('quantity'))
+        .order_by()
+    )
+    created = DailyUsage.objects.bulk_create(
+        [
+            DailyUsage(date=r['day'], variant_id=r['variant_id'], user_id=r['user_id'],
+                       type=r['type'], quantity=r['total'])
+            for r in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+    return len(created)
@@ -0,0 +1,153 @@
+# inventory/services/search.py
+import re
+
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+
+from inventory.models import (
+    Item, ProductVariant, SearchToken, Spec, normalize_search_text, extract_chosung
+)
+
+# 필드별 가중치 (검색 결과 정렬용)
+FIELD_WEIGHTS = {
+    'name': 3,
+    'label': 2,
+    'description': 1,
+}
+# 필드 → 색인 대상
+FIELD_KINDS = {
+    'name': 'item',
+    'label': 'spec',
+    'description': 'item',
+}
+
+
+def normalize(text):
+    """소문자 + 공백 제거 (색인과 검색어에 동일하게 적용)"""
+    return normalize_search_text(text)
+
+def index_tokens(text):
+    """색인용 조각: 모든 1글자 + 연속 2글자"""
+    text = normalize(text)
+    return {*text, *(text[i:i + 2] for i in range(len(text) - 1))}
+
+def query_tokens(query):
+    """검색어 조각: 1글자면 그대로, 2글자 이상이면 연속 2글자"""
+    text = normalize(query)
+    if len(text) <= 1:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+def _replace_tokens(kind, objects, fields):
+    SearchToken.objects.filter(kind=kind, object_id__in=[obj.pk for obj in objects]).delete()
+    SearchToken.objects.bulk_create([
+        SearchToken(kind=kind, object_id=obj.pk, field=field, token=token)
+        for obj in objects
+        for field in fields
+        for token in index_tokens(getattr(obj, field))
+    ], batch_size=1000)
+
+@transaction.atomic
+def index_items(items):
+    _replace_tokens('item', list(items), ['name', 'description'])
+
+@transaction.atomic
+def index_specs(specs):
+    _replace_tokens('spec', list(specs), ['label'])
+
+def unindex(kind, object_ids):
+    SearchToken.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+@transaction.atomic
+def rebuild_search_index():
+    SearchToken.objects.all().delete()
+    index_items(Item.objects.only('id', 'name', 'description').iterator())
+    index_specs(Spec.objects.only('id', 'label').iterator())
+    return SearchToken.objects.count()
+
+def _matching_ids(kind, field, tokens):
+    """
+    모든 조각을 field 안에 가진 대상 id (서브쿼리)
+    """
+    return (
+        SearchToken.objects.filter(kind=kind, field=field, token__in=tokens)
+        .values('object_id')
+        .annotate(hits=Count('token', distinct=True))
+        .filter(hits=len(tokens))
+        .values('object_id')
+        .order_by()
+    )
+
+def rank_variants(query, queryset=None):
+    """
+    검색어 → 관련도 순으로 정렬된 품목규격 queryset (rank 주석 포함, 쿼리 1회)
+    (품목명 > 규격 > 설명, 같은 점수면 품목명·규격 순)
+    """
+    queryset = ProductVariant.objects.all() if queryset is None else queryset
+    tokens = query_tokens(query)
+    if not tokens:
+        return queryset.none()
+    # 가중치가 높은 필드부터 검사하므로 첫 번째로 맞는 When 이 최고 점수
+    whens = [
+        When(**{f'{FIELD_KINDS[field]}_id__in': _matching_ids(FIELD_KINDS[field], field, tokens)}, then=Value(weight))
+        for field, weight in sorted(FIELD_WEIGHTS.items(), key=lambda fw: -fw[1])
+    ]
+    return (
+        queryset.annotate(rank=Case(*whens, default=Value(0), output_field=IntegerField()))
+        .filter(rank__gt=0)
+        .order_by('-rank', 'item__name', 'spec__sort_key', 'spec__label')
+    )
+
+def search_variants(query, queryset=None, limit=None):
+    """
+    검색어 → 관련도 순 [(variant_id, item_id), ...]
+    """
+    rows = rank_variants(query, queryset).values_list('id', 'item_id')
+    return list(rows[:limit] if limit else rows)
+
+# 🔹 자동완성 (초성 / 이름 / 코드 앞부분 일치)
+JAMO_RE = re.compile(r'[ㄱ-ㅎ]')
+
+def _prefix_q(field, prefix):
+    # LIKE 'x%' 대신 범위 비교 → 모든 DB 에서 일반 인덱스 사용
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\U0010ffff'})
+
+def _suggest_q(query):
+    text = normalize_search_text(query)
+    if not text:
+        return None
+    if JAMO_RE.search(text):
+        condition = _prefix_q('search_initials', extract_chosung(text))
+    else:
+        condition = _prefix_q('search_name', text)
+    return condition
+
+def suggest_variants(query, limit=20):
+    """
+    검색어 앞부분으로 품목규격 자동완성 — 'ㄱㅈ'(초성), '면장'(이름), 'M그1'(코드)
+    """
+    condition = _suggest_q(query)
+    if condition is None:
+        return []
+    code = query.strip().upper()
+    rows = (
+        ProductVariant.objects.filter(condition | _prefix_q('code', code))
+        .values('id', 'code', 'current_quantity', 'item__name', 'spec__label')
+        .order_by('item__name', 'spec__sort_key', 'spec__label')[:limit]
+    )
+    return [
+        {
+            'id': r['id'],
+            'label': f"{r['item__name']} - {r['spec__label']}",
+            'code': r['code'],
+            'stock': r['current_quantity'],
+        }
+        for r in rows
+    ]
+
+def refresh_variant_search_keys(variants):
+    """품목명/규격 라벨 변경 시 관련 품목규격의 검색 키 일괄 갱신"""
+    variants = list(variants.select_related('item', 'spec'))
+    for variant in variants:
+        variant.set_search_keys()
+    ProductVariant.objects.bulk_update(variants, ['search_name', 'search_initials'], batch_size=500)
@@ -0,0 +1,93 @@
+# inventory/services/snapshots.py
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Sum, When
+from django.utils import timezone
+
+from inventory.models import DailyUsage, ProductVariant, StockSnapshot
+
+
+def _net_usage(variants, after=None, until=None):
+    """
+    일별 집계 기준 품목규격별 순증감 (입고 - 소모), after < 일자 <= until
+    반환: {variant_id: 순증감}
+    """
+    rows = DailyUsage.objects.filter(variant__in=variants.values('id'))
+    if after:
+        rows = rows.filter(date__gt=after)
+    if until:
+        rows = rows.filter(date__lte=until)
+    rows = rows.values('variant_id').annotate(
+        net=Sum(Case(
+            When(type='IN', then=F('quantity')),
+            default=-F('quantity'),
+            output_field=IntegerField(),
+        ))
+    ).order_by()
+    return {row['variant_id']: row['net'] for row in rows}
+
+def stock_as_of(date, variants=None):
+    """
+    date 마감 기준 품목규격별 재고 {variant_id: 수량}
+    가장 가까운 이전 스냅샷 + 그 이후 일별 집계 증감분만 반영 (스냅샷이 없으면 현재 재고에서 역산)
+    variants: ProductVariant queryset (기본 전체)
+    """
+    variants = (ProductVariant.objects.all() if variants is None else variants).order_by()
+    if date >= timezone.localdate():
+        return dict(variants.values_list('id', 'current_quantity'))
+
+    base_date = StockSnapshot.objects.filter(date__lte=date).aggregate(latest=Max('date'))['latest']
+    if base_date is None:
+        quantities = dict(variants.values_list('id', 'current_quantity'))
+        for variant_id, net in _net_usage(variants, after=date).items():
+            if variant_id in quantities:
+                quantities[variant_id] -= net
+        return quantities
+
+    snapshot = dict(
+        StockSnapshot.objects.filter(date=base_date, variant__in=variants.values('id'))
+        .values_list('variant_id', 'quantity')
+    )
+    # 스냅샷 이후에 만들어진 품목규격은 0 에서 시작
+    quantities = {variant_id: snapshot.get(variant_id, 0) for variant_id in variants.values_list('id', flat=True)}
+    if base_date < date:
+        for variant_id, net in _net_usage(variants, after=base_date, until=date).items():
+            if variant_id in quantities:
+                quantities[variant_id] += net
+    return quantities
+
+def shift_snapshots(variant_id, since, delta):
+    """
+    since 일자 이후 마감 스냅샷에 재고 증감 반영 — 지난 일자의 기록을 취소/변경할 때 호출
+    (일별 집계는 기록 일자에서 바뀌므로, 그 뒤 스냅샷을 고치지 않으면 현재 재고와 어긋남)
+    반환: 갱신한 스냅샷 수
+    """
+    return StockSnapshot.objects.filter(variant_id=variant_id, date__gte=since).update(
+        quantity=F('quantity') + delta
+    )
+
+@transaction.atomic
+def take_stock_snapshot(date=None):
+    """
+    date(기본: 어제) 마감 재고 스냅샷 저장 — 같은 일자 스냅샷은 다시 계산해 덮어씀
+    마감되지 않은 오늘 이후 일자는 저장하지 않음 (이후 증감분 계산이 어긋남)
+    반환: 저장한 행 수
+    """
+    today = timezone.localdate()
+    date = date or today - timedelta(days=1)
+    if date >= today:
+        raise ValidationError("마감된 일자(어제 이전)만 스냅샷을 저장할 수 있습니다.")
+
+    StockSnapshot.objects.filter(date=date).delete()
+    quantities = stock_as_of(date)
+    created = StockSnapshot.objects.bulk_create(
+        [
+            # 관리자 화면에서 재고를 직접 수정한 경우 기록상 음수가 될 수 있음
+            StockSnapshot(date=date, variant_id=variant_id, quantity=max(quantity, 0))
+            for variant_id, quantity in quantities.items()
+        ],
+        batch_size=1000,
+    )
+    return len(created)
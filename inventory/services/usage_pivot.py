@@ -0,0 +1,96 @@
+# inventory/services/usage_pivot.py
+import hashlib
+import json
+
+import pandas as pd
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import F, IntegerField, Sum
+from django.db.models.functions import TruncMonth
+
+from inventory.models import DailyUsage
+
+# 피벗 축: 이름 → (집계 쿼리 필드, 표시 이름)
+PIVOT_DIMENSIONS = {
+    'category': ('variant__item__category__name', '사용처'),
+    'user': ('user__name', '사용자'),
+    'month': ('month', '월'),
+}
+PIVOT_VALUES = {
+    'amount': '금액',
+    'quantity': '수량',
+}
+PIVOT_TOTAL_LABEL = '합계'
+PIVOT_CACHE_TIMEOUT = 60 * 10
+
+
+def _usage_frame(start=None, end=None):
+    """
+    소모(OUT) 일별 집계를 월 × 사용처 × 사용자로 묶은 DataFrame (그룹 집계 쿼리 1회)
+    """
+    rows = DailyUsage.objects.filter(type='OUT')
+    if start:
+        rows = rows.filter(date__gte=start)
+    if end:
+        rows = rows.filter(date__lte=end)
+    rows = (
+        rows.annotate(month=TruncMonth('date'))
+        .values('month', 'variant__item__category__name', 'user__name')
+        .annotate(
+            total_quantity=Sum('quantity'),
+            total_amount=Sum(F('quantity') * F('variant__unit_price'), output_field=IntegerField()),
+        )
+        .order_by()
+    )
+    df = pd.DataFrame.from_records(
+        list(rows),
+        columns=['month', 'variant__item__category__name', 'user__name', 'total_quantity', 'total_amount'],
+    )
+    df = df.rename(columns={
+        **{field: name for name, (field, _) in PIVOT_DIMENSIONS.items()},
+        'total_quantity': 'quantity',
+        'total_amount': 'amount',
+    })
+    df['category'] = df['category'].fillna('미지정')
+    df['user'] = df['user'].fillna('미지정')
+    df['month'] = pd.to_datetime(df['month']).dt.strftime('%Y-%m')
+    return df
+
+def _cache_key(*signature):
+    digest = hashlib.md5(json.dumps(signature, default=str).encode()).hexdigest()
+    return f"inventory:usage_pivot:{digest}"
+
+def usage_pivot(rows='category', cols='month', value='amount', start=None, end=None):
+    """
+    소모 금액/수량 피벗 (rows × cols, 합계 행·열 포함) — 같은 조건은 10분간 캐시
+    반환: {'rows', 'cols', 'value', 'index': [...], 'columns': [...], 'data': [[...], ...]}
+    """
+    if rows not in PIVOT_DIMENSIONS or cols not in PIVOT_DIMENSIONS or rows == cols:
+        raise ValidationError("피벗 행/열은 category, user, month 중 서로 다른 두 가지여야 합니다.")
+    if value not in PIVOT_VALUES:
+        raise ValidationError("피벗 값은 amount 또는 quantity 여야 합니다.")
+
+    key = _cache_key(rows, cols, value, start, end)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    df = _usage_frame(start, end)
+    result = {'rows': rows, 'cols': cols, 'value': value, 'index': [], 'columns': [], 'data': []}
+    if not df.empty:
+        table = df.pivot_table(
+            index=rows, columns=cols, values=value, aggfunc='sum',
+            fill_value=0, margins=True, margins_name=PIVOT_TOTAL_LABEL,
+        )
+        result.update(
+            index=[str(label) for label in table.index],
+            columns=[str(label) for label in table.columns],
+            data=table.astype('int64').values.tolist(),
+        )
+    cache.set(key, result, timeout=PIVOT_CACHE_TIMEOUT)
+    return result
+
+def pivot_export_rows(result):
+    """피벗 결과 → 다운로드용 (헤더, 행 리스트)"""
+    header = [f"{PIVOT_DIMENSIONS[result['rows']][1]} \\ {PIVOT_DIMENSIONS[result['cols']][1]}", *result['columns']]
+    return header, [[label, *values] for label, values in zip(result['index'], result['data'])]
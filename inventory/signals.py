@@ -1,31 +1,43 @@
-import re
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import ProductVariant
+from .models import ProductVariant, Item, Spec, UsageCategory, InventoryUser
+from .services.alerts import sync_low_stock
+from .services.catalog import bump_catalog_version
+from .services.dimensions import clear_dimension_cache
+from .services.search import index_items, index_specs, refresh_variant_search_keys, unindex
 
-def extract_initials(name):
-    name = re.sub(r'[^가-힣A-Za-z]', '', name).upper()
-    return ''.join([w[0] for w in name])[:2] or 'XX'
+# 🔹 카탈로그 캐시 무효화 (품목/규격/품목규격/사용처 변경 시 버전 증가)
+for _model in (Item, Spec, ProductVariant, UsageCategory):
+    post_save.connect(bump_catalog_version, sender=_model, dispatch_uid=f'catalog_save_{_model.__name__}')
+    post_delete.connect(bump_catalog_version, sender=_model, dispatch_uid=f'catalog_delete_{_model.__name__}')
 
-def extract_spec_number(spec):
-    return re.sub(r'[^0-9]', '', spec)
+# 🔹 사용처/사용자 메모리 캐시 비우기
+for _model in (UsageCategory, InventoryUser):
+    post_save.connect(clear_dimension_cache, sender=_model, dispatch_uid=f'dimension_save_{_model.__name__}')
+    post_delete.connect(clear_dimension_cache, sender=_model, dispatch_uid=f'dimension_delete_{_model.__name__}')
 
-@receiver(pre_save, sender=ProductVariant)
-def generate_product_code(sender, instance, **kwargs):
-    if not instance.code:
-        item_initials = extract_initials(instance.item.name)
-        spec_digits = extract_spec_number(instance.spec.name)
-        base = f"{item_initials}{spec_digits}"
+# 🔹 검색 색인 동기화
+@receiver(post_save, sender=Item)
+def index_item(sender, instance, created, **kwargs):
+    index_items([instance])
+    if not created:
+        refresh_variant_search_keys(ProductVariant.objects.filter(item=instance))
 
-        # 중복 방지 번호
-        similar = sender.objects.filter(code__startswith=base).order_by('-code')
-        if similar.exists():
-            last_code = similar.first().code
-            try:
-                number = int(last_code.split('-')[-1])
-            except:
-                number = 0
-        else:
-            number = 0
+@receiver(post_save, sender=Spec)
+def index_spec(sender, instance, created, **kwargs):
+    index_specs([instance])
+    if not created:
+        refresh_variant_search_keys(ProductVariant.objects.filter(spec=instance))
 
-        instance.code = f"{base}-{number + 1:03d}"
+@receiver(post_delete, sender=Item)
+def unindex_item(sender, instance, **kwargs):
+    unindex('item', [instance.pk])
+
+@receiver(post_delete, sender=Spec)
+def unindex_spec(sender, instance, **kwargs):
+    unindex('spec', [instance.pk])
+
+# 🔹 재고 부족 상태 동기화 (관리자 화면 등에서 재고/안전 재고를 직접 수정한 경우)
+@receiver(post_save, sender=ProductVariant)
+def sync_variant_low_stock(sender, instance, **kwargs):
+    sync_low_stock([instance.pk])
@@ -0,0 +1,158 @@
+"""
+테스트용 데이터와 쿼리 예산 검사 도우미
+
+    from inventory.testing import QueryBudgetTestMixin
+
+    class UrlQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+        pass
+
+inventory/urls.py 의 모든 URL 을 시드 데이터로 호출해 settings.INVENTORY_QUERY_BUDGETS 이하인지 확인
+(새 URL 을 추가하면 URL_REQUESTS 와 INVENTORY_QUERY_BUDGETS 에도 등록해야 함)
+"""
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from inventory import urls as inventory_urls
+from inventory.middleware import get_query_budget, is_counted_query
+from inventory.models import (
+    InventoryLog, InventoryUser, Item, PendingStockBatch, PendingStockItem, ProductVariant, Spec, UsageCategory,
+)
+from inventory.services.dimensions import clear_dimension_cache
+from inventory.services.inventory import apply_stock_movements
+
+
+def seed_inventory_dataset(items=6, specs_per_item=3, users=3):
+    """
+    N+1 이 드러나도록 관계마다 여러 행을 가진 작은 데이터셋 생성
+    반환: URL 인자/요청 본문에 쓸 객체 dict
+    """
+    categories = [UsageCategory.objects.create(name=f"사용처{n}") for n in range(1, 3)]
+    people = [InventoryUser.objects.create(name=f"사용자{n}") for n in range(1, users + 1)]
+    InventoryUser.objects.create(name="system")
+    specs = [Spec.objects.create(label=f"{n * 10}mm") for n in range(1, specs_per_item + 1)]
+    variants = []
+    for n in range(items):
+        item = Item.objects.create(name=f"장갑{n}", category=categories[n % len(categories)])
+        for spec in specs:
+            variants.append(ProductVariant.objects.create(item=item, spec=spec, min_quantity=5, unit_price=100))
+
+    for person in people:
+        apply_stock_movements([(variant.id, 20) for variant in variants], 'IN', person)
+        apply_stock_movements([(variant.id, 3) for variant in variants], 'OUT', person)
+
+    batches = []
+    for n in range(2):
+        batch = PendingStockBatch.objects.create(supplier=f"거래처{n}", uploaded_at=timezone.now())
+        PendingStockItem.objects.bulk_create([
+            PendingStockItem(batch=batch, item=variant.item, spec=variant.spec, quantity=2)
+            for variant in variants[:5]
+        ])
+        batches.append(batch)
+    PendingStockBatch.objects.create(supplier="완료", uploaded_at=timezone.now() - timedelta(days=1), status='DONE')
+
+    return {
+        'user': people[0],
+        'item': variants[0].item,
+        'variants': variants,
+        'batch': batches[0],
+        'batches': batches,
+        'out_log': InventoryLog.objects.filter(type='OUT').first(),
+    }
+
+
+def _json(data):
+    return {'data': json.dumps(data), 'content_type': 'application/json'}
+
+
+# URL 이름 → 시드 데이터로 요청을 만드는 함수 (method, url, 추가 인자)
+URL_REQUESTS = {
+    'kiosk_input': lambda d: ('get', reverse('kiosk_input'), {}),
+    'inventory_status': lambda d: ('get', reverse('inventory_status') + '?q=장갑', {}),
+    'stock_as_of': lambda d: ('get', reverse('stock_as_of'), {}),
+    'export_stock_as_of': lambda d: ('get', reverse('export_stock_as_of') + '?format=csv', {}),
+    'inventory_history': lambda d: ('get', reverse('inventory_history'), {}),
+    'add_stock': lambda d: ('get', reverse('add_stock'), {}),
+    'add_stock_ajax': lambda d: ('post', reverse('add_stock_ajax'), _json({
+        'user': d['user'].id, 'variants': [{'id': v.id, 'qty': 1} for v in d['variants']],
+    })),
+    'add_item_ajax': lambda d: ('post', reverse('add_item_ajax'), _json({
+        # 규격마다 코드 접두어가 달라지도록 실제 등록처럼 여러 규격 (기존 규격 10mm 포함)
+        'name': '새품목', 'specs': ', '.join(['10mm'] + [f"{n}mm" for n in range(100, 130)]),
+        'category_id': d['item'].category_id,
+    })),
+    'export_inventory_log': lambda d: ('get', reverse('export_inventory_log') + '?format=csv', {}),
+    'paste_table_upload': lambda d: ('post', reverse('paste_table_upload'), {'data': {'json_data': json.dumps([
+        # 거래처마다 입고 대기건이 따로 생기므로 여러 거래처로 나눔
+        [timezone.localdate().isoformat(), f"거래처{n % 5}", v.item.name, v.spec.label, '3']
+        for n, v in enumerate(d['variants'])
+    ])}}),
+    'pending_stock_list': lambda d: ('get', reverse('pending_stock_list'), {}),
+    'get_batch_items': lambda d: ('get', reverse('get_batch_items', args=[d['batch'].id]), {}),
+    'process_pending_stock': lambda d: ('post', reverse('process_pending_stock', args=[d['batch'].id]), _json({
+        'quantities': [{'id': entry.id, 'qty': entry.quantity} for entry in d['batch'].items.all()],
+    })),
+    'process_pending_batches': lambda d: ('post', reverse('process_pending_batches'), _json({
+        'batch_ids': [batch.id for batch in d['batches']],
+    })),
+    'update_pending_quantities': lambda d: ('post', reverse('update_pending_quantities'), _json({
+        'batch_id': d['batch'].id,
+        'updates': [{'id': entry.id, 'quantity': 7} for entry in d['batch'].items.all()],
+    })),
+    'cancel_pending_stock': lambda d: ('get', reverse('cancel_pending_stock', args=[d['batch'].id]), {}),
+    'search_variants_api': lambda d: ('get', reverse('search_variants_api') + '?q=장갑', {}),
+    'suggest_variants_api': lambda d: ('get', reverse('suggest_variants_api') + '?q=ㅈㄱ', {}),
+    'cancel_out_log': lambda d: ('post', reverse('cancel_out_log', args=[d['out_log'].id]), {}),
+    'kiosk_input_ajax': lambda d: ('post', reverse('kiosk_input_ajax'), _json({
+        'user': d['user'].id, 'variants': [{'id': v.id, 'qty': 1} for v in d['variants']],
+    })),
+    'usage_stat': lambda d: ('get', reverse('usage_stat'), {}),
+    'export_usage_stat_excel': lambda d: ('get', reverse('export_usage_stat_excel') + '?format=csv', {}),
+    'usage_pivot': lambda d: ('get', reverse('usage_pivot'), {}),
+    'usage_pivot_api': lambda d: ('get', reverse('usage_pivot_api'), {}),
+}
+
+
+def measure_url_queries(client, method, url, kwargs):
+    """
+    캐시를 비운 상태(최악의 경우)에서 요청 1회의 쿼리 수 — 요청의 변경 사항은 롤백
+    반환: (응답, 쿼리 수)
+    """
+    cache.clear()
+    clear_dimension_cache()
+    with transaction.atomic():
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(client, method)(url, **kwargs)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+        transaction.set_rollback(True)
+    queries = [q for q in ctx.captured_queries if is_counted_query(q['sql'])]
+    return response, len(queries)
+
+
+class QueryBudgetTestMixin:
+    """inventory/urls.py 의 모든 URL 이 쿼리 예산 안에서 정상 응답하는지 검사"""
+
+    def test_url_query_budgets(self):
+        dataset = seed_inventory_dataset()
+        names = [pattern.name for pattern in inventory_urls.urlpatterns if pattern.name]
+        missing = [name for name in names if name not in URL_REQUESTS]
+        self.assertFalse(missing, f"URL_REQUESTS 에 요청이 정의되지 않은 URL: {missing}")
+
+        for name in names:
+            with self.subTest(url=name):
+                self.assertIn(name, settings.INVENTORY_QUERY_BUDGETS, f"INVENTORY_QUERY_BUDGETS 에 '{name}' 예산이 없습니다.")
+                budget = get_query_budget(name)
+                method, url, kwargs = URL_REQUESTS[name](dataset)
+                response, count = measure_url_queries(self.client, method, url, kwargs)
+                self.assertLess(response.status_code, 400, f"{name} 응답 {response.status_code}")
+                if response.get('Content-Type', '').startswith('application/json'):
+                    self.assertTrue(response.json().get('success'), f"{name} 실패 응답: {response.json()}")
+                self.assertLessEqual(count, budget, f"{name}: 쿼리 {count}건 > 예산 {budget}건")
@@ -1,3 +1,129 @@
+import json
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from inventory.models import (
+    CodeSequence, DailyUsage, InventoryLog, InventoryUser, Item, ProductVariant, Spec, StockSnapshot, allocate_codes,
+)
+from inventory.services.inventory import apply_stock_movements, cancel_stock_out
+from inventory.services.rollup import rebuild_daily_usage
+from inventory.services.snapshots import stock_as_of, take_stock_snapshot
+from inventory.testing import QueryBudgetTestMixin
+
+
+class UrlQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """모든 URL 의 쿼리 수가 settings.INVENTORY_QUERY_BUDGETS 이하인지 확인 (N+1 회귀 방지)"""
+
+
+class StockMovementTests(TestCase):
+    """입출고 반영/취소 시 재고, 기록, 일별 집계가 함께 움직이는지 확인"""
+
+    def setUp(self):
+        self.variant = ProductVariant.objects.create(
+            item=Item.objects.create(name="장갑"), spec=Spec.objects.create(label="L"), min_quantity=5,
+        )
+        self.user = InventoryUser.objects.create(name="사용자")
+        apply_stock_movements([(self.variant.id, 10)], 'IN', self.user)
+
+    def test_stock_out_beyond_quantity_is_rejected(self):
+        # 같은 품목이 여러 줄이면 합계로 검사
+        with self.assertRaises(ValidationError):
+            apply_stock_movements([(self.variant.id, 6), (self.variant.id, 5)], 'OUT', self.user)
+
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.current_quantity, 10)
+        self.assertFalse(InventoryLog.objects.filter(type='OUT').exists())
+        self.assertFalse(DailyUsage.objects.filter(type='OUT').exists())
+
+    def test_unknown_variant_rejects_whole_batch(self):
+        with self.assertRaises(ValidationError):
+            apply_stock_movements([(self.variant.id, 1), (self.variant.id + 100, 1)], 'OUT', self.user)
+        self.assertEqual(InventoryLog.objects.count(), 1)
+
+    def test_malformed_entries_return_400(self):
+        for variants in ([1, 2], [{'id': self.variant.id, 'qty': 1}, 'x'], 3):
+            with self.subTest(variants=variants):
+                response = self.client.post(
+                    reverse('kiosk_input_ajax'),
+                    data=json.dumps({'user': self.user.id, 'variants': variants}),
+                    content_type='application/json',
+                )
+                self.assertEqual(response.status_code, 400)
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.current_quantity, 10)
+
+    def test_cancel_stock_out_restores_quantity(self):
+        log = apply_stock_movements([(self.variant.id, 7)], 'OUT', self.user)[0]
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.current_quantity, 3)
+        self.assertTrue(self.variant.is_low)
+
+        cancel_stock_out(log)
+
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.current_quantity, 10)
+        self.assertFalse(self.variant.is_low)
+        self.assertFalse(InventoryLog.objects.filter(type='OUT').exists())
+        out_total = sum(DailyUsage.objects.filter(type='OUT').values_list('quantity', flat=True))
+        self.assertEqual(out_total, 0)
+
+    def test_cancel_stock_out_of_deleted_variant_fails(self):
+        log = apply_stock_movements([(self.variant.id, 2)], 'OUT', self.user)[0]
+        ProductVariant.objects.filter(id=self.variant.id).delete()
+        with self.assertRaises(ValidationError):
+            cancel_stock_out(log)
+
+
+class CodeAllocationTests(TestCase):
+    """품목 코드 일련번호가 중복/재사용되지 않는지 확인"""
+
+    def test_codes_continue_after_existing_codes(self):
+        variant = ProductVariant.objects.create(item=Item.objects.create(name="장갑"), spec=Spec.objects.create(label="10"))
+        # 일련번호 테이블 도입 전에 만들어진 코드
+        ProductVariant.objects.filter(id=variant.id).update(code="장갑10-007")
+        CodeSequence.objects.all().delete()
+
+        self.assertEqual(allocate_codes(["장갑10", "장갑20", "장갑10"]), ["장갑10-008", "장갑20-001", "장갑10-009"])
+        self.assertEqual(allocate_codes(["장갑10"]), ["장갑10-010"])
+
+    def test_released_codes_are_not_reused(self):
+        first = allocate_codes(["AB1"] * 3)
+        # 예약 후 저장하지 않은 번호도 다시 나오지 않음
+        second = allocate_codes(["AB1"] * 2)
+        self.assertEqual(first + second, [f"AB1-{n:03d}" for n in range(1, 6)])
+        self.assertEqual(CodeSequence.objects.get(prefix="AB1").last_value, 5)
+
+
+class StockSnapshotTests(TestCase):
+    """스냅샷 체인이 현재 재고와 어긋나지 않는지 확인"""
+
+    def test_cancel_before_snapshot_keeps_chain_consistent(self):
+        variant = ProductVariant.objects.create(item=Item.objects.create(name="장갑"), spec=Spec.objects.create(label="L"))
+        user = InventoryUser.objects.create(name="사용자")
+        apply_stock_movements([(variant.id, 10)], 'IN', user)
+        apply_stock_movements([(variant.id, 4)], 'OUT', user)
+        log = InventoryLog.objects.get(type='OUT')
+        InventoryLog.objects.filter(type__in=['IN', 'OUT']).update(timestamp=timezone.now() - timedelta(days=3))
+        log.refresh_from_db()
+        rebuild_daily_usage()
+
+        take_stock_snapshot(timezone.localdate() - timedelta(days=2))
+        cancel_stock_out(log)
+        take_stock_snapshot()
+
+        variant.refresh_from_db()
+        self.assertEqual(variant.current_quantity, 10)
+        self.assertEqual(stock_as_of(timezone.localdate() - timedelta(days=2))[variant.id], 10)
+        self.assertEqual(StockSnapshot.objects.get(date=timezone.localdate() - timedelta(days=1)).quantity, 10)
+        # 기록 이전 일자는 그대로
+        self.assertEqual(stock_as_of(timezone.localdate() - timedelta(days=4))[variant.id], 0)
 
-# Create your tests here.
+    def test_stock_as_of_ignores_invalid_category(self):
+        for name in ('stock_as_of', 'export_stock_as_of'):
+            with self.subTest(url=name):
+                response = self.client.get(reverse(name), {'category': 'abc', 'format': 'csv'})
+                self.assertEqual(response.status_code, 200)
@@ -3,14 +3,18 @@ from inventory.views import kiosk_input, kiosk_input_ajax
 from inventory.views import add_stock, inventory_status, inventory_history, add_stock_ajax
 from inventory.views import (
     paste_table_upload, pending_stock_list, get_batch_items,
-    process_pending_stock, update_pending_quantities, cancel_pending_stock, pending_stock_items
+    process_pending_stock, update_pending_quantities, cancel_pending_stock,
+    process_pending_batches
 )
-from inventory.views import get_variants_by_item, add_item_ajax, cancel_out_log
+from inventory.views import get_variants_by_item, add_item_ajax, cancel_out_log, search_variants_api, suggest_variants_api
 from inventory.views import export_inventory_log, usage_stat_view, export_usage_stat_excel
+from inventory.views import stock_as_of_view, export_stock_as_of, usage_pivot_view, usage_pivot_api
 
 urlpatterns = [
     path('', kiosk_input, name='kiosk_input'),
     path('status/', inventory_status, name='inventory_status'),
+    path('status/as_of/', stock_as_of_view, name='stock_as_of'),
+    path('status/as_of/export/', export_stock_as_of, name='export_stock_as_of'),
     path('history/', inventory_history, name='inventory_history'),
     path('add/', add_stock, name='add_stock'),
     path('add_stock_ajax/', add_stock_ajax, name='add_stock_ajax'),
@@ -22,13 +26,17 @@ urlpatterns = [
     path('pending_stock/', pending_stock_list, name='pending_stock_list'),
     path('pending_stock/<int:batch_id>/items/', get_batch_items, name='get_batch_items'),
     path('pending_stock/<int:batch_id>/process/', process_pending_stock, name='process_pending_stock'),
+    path('pending_stock/process/', process_pending_batches, name='process_pending_batches'),
     path('pending_stock/update_quantities/', update_pending_quantities, name='update_pending_quantities'),
     path('pending_stock/<int:batch_id>/cancel/', cancel_pending_stock, name='cancel_pending_stock'),
-    path('pending_stock/<int:batch_id>/items/', pending_stock_items, name='pending_stock_items'),
 
     # 기타
+    path('api/variants/search/', search_variants_api, name='search_variants_api'),
+    path('api/variants/suggest/', suggest_variants_api, name='suggest_variants_api'),
     path('history/cancel/<int:log_id>/', cancel_out_log, name='cancel_out_log'),
     path('kiosk_input_ajax/', kiosk_input_ajax, name='kiosk_input_ajax'),
     path('usage_stat/', usage_stat_view, name='usage_stat'),
     path('usage_stat/export/', export_usage_stat_excel, name='export_usage_stat_excel'),
+    path('usage_stat/pivot/', usage_pivot_view, name='usage_pivot'),
+    path('api/usage/pivot/', usage_pivot_api, name='usage_pivot_api'),
 ]
@@ -1,29 +1,21 @@
 import re
 
-def extract_number(label):
-    match = re.search(r'\d+', label)
-    return int(match.group()) if match else 0
-
 def build_variant_map(variants):
+    """
+    품목별 규격 목록 {item_id: [{'id', 'spec_label', 'stock'}, ...]}
+    variants 는 규격 자연 정렬(spec__sort_key) 순서로 넘겨야 함
+    """
     variant_map = {}
     for variant in variants:
-        item_id = str(variant.item.id)
-        if item_id not in variant_map:
-            variant_map[item_id] = []
-        variant_map[item_id].append({
+        variant_map.setdefault(str(variant.item.id), []).append({
             'id': variant.id,
             'spec_label': variant.spec.label,
             'stock': variant.current_quantity,
-            'sort_key': extract_number(variant.spec.label)
         })
-    for v_list in variant_map.values():
-        v_list.sort(key=lambda x: x['sort_key'])
-        for v in v_list:
-            v.pop('sort_key')
     return variant_map
 
 # utils.py
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, FileResponse, StreamingHttpResponse
 
 def response_success(message=None, data=None):
     """
@@ -101,6 +93,49 @@ def apply_filters(queryset, request, field_map):
                 queryset = queryset.filter(**{f: value})
     return queryset
 
+def safe_date(val):
+    """
+    date 객체 또는 'YYYY-MM-DD' 문자열 → date (비어 있거나 형식 오류면 None)
+    """
+    from datetime import date
+    from django.utils.dateparse import parse_date
+
+    if not val:
+        return None
+    if isinstance(val, date):
+        return val
+    try:
+        return parse_date(str(val))
+    except ValueError:
+        return None
+
+def date_range_bounds(start=None, end=None):
+    """
+    로컬 날짜 범위(시작일~종료일, 양끝 포함) → [start, end) aware datetime 경계
+    날짜는 date 객체 또는 'YYYY-MM-DD' 문자열, 비어 있거나 형식 오류면 None
+    """
+    from datetime import datetime, time, timedelta
+    from django.utils import timezone
+
+    def _start_of(d):
+        return timezone.make_aware(datetime.combine(d, time.min))
+
+    start_date, end_date = safe_date(start), safe_date(end)
+    lower = _start_of(start_date) if start_date else None
+    upper = _start_of(end_date + timedelta(days=1)) if end_date else None
+    return lower, upper
+
+def filter_date_range(queryset, start=None, end=None, field='timestamp'):
+    """
+    날짜 범위 필터 — timestamp__date 대신 timestamp 범위 비교로 인덱스 사용 가능
+    """
+    lower, upper = date_range_bounds(start, end)
+    if lower:
+        queryset = queryset.filter(**{f'{field}__gte': lower})
+    if upper:
+        queryset = queryset.filter(**{f'{field}__lt': upper})
+    return queryset
+
 def dataframe_to_excel_response(df, filename="export.xlsx"):
     """
     Pandas DataFrame을 엑셀 다운로드로 반환
@@ -112,32 +147,197 @@ def dataframe_to_excel_response(df, filename="export.xlsx"):
     df.to_excel(response, index=False, engine='openpyxl')
     return response
 
-def batch_process_stock(model, func, variant_entries, user, is_in=True):
-    """
-    입출고(배치) 처리, 반복 에러 메시지 통일
-    model: ProductVariant 등
-    func: process_stock_in/out
-    variant_entries: [{'id': id, 'qty': qty}, ...]
-    user: 유저객체
-    is_in: 입고/출고 구분 (True: 입고)
-    """
-    errors = []
-    for entry in variant_entries:
-        variant_id = entry.get('id')
-        quantity = entry.get('qty')
-        if not variant_id or not quantity:
-            errors.append("항목 정보가 부족합니다.")
-            continue
-        qty, err = safe_int(quantity)
-        if err:
-            errors.append(err)
-            continue
-        try:
-            variant = model.objects.get(id=variant_id)
-            func(variant, qty, user)
-        except Exception as e:
-            errors.append(f"{variant_id}: 오류 발생 - {e}")
-    return errors
+def rows_to_excel_response(columns, rows, filename="export.xlsx", chunk_size=64 * 1024):
+    """
+    행 이터레이터를 엑셀 다운로드로 스트리밍 반환 (DataFrame 없이, 메모리 사용량 일정)
+    columns: 헤더 리스트, rows: 튜플/리스트 이터레이터 (queryset.iterator() 등)
+    write_only 워크북은 행을 임시 파일에 바로 기록하므로 전체 데이터를 메모리에 올리지 않음
+    """
+    import tempfile
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(columns))
+    for row in rows:
+        ws.append(list(row))
+
+    tmp = tempfile.TemporaryFile()
+    wb.save(tmp)
+    tmp.seek(0)
+    response = FileResponse(
+        tmp,
+        as_attachment=True,
+        filename=filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+    response.block_size = chunk_size
+    return response
+
+def rows_to_csv_response(columns, rows, filename="export.csv"):
+    """
+    행 이터레이터를 CSV 로 스트리밍 반환 (조회가 끝나기 전에 첫 바이트 전송)
+    엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 을 붙임
+    """
+    import csv
+    from urllib.parse import quote
+
+    class _Echo:
+        def write(self, value):
+            return value
+
+    def _generate():
+        writer = csv.writer(_Echo())
+        yield '\ufeff' + writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(_generate(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f"attachment; filename*=utf-8''{quote(filename)}"
+    return response
+
+def rows_to_ndjson_response(columns, rows, filename="export.ndjson"):
+    """
+    행 이터레이터를 NDJSON(한 줄에 JSON 객체 하나, 헤더를 키로 사용)으로 스트리밍 반환
+    """
+    import json
+    from urllib.parse import quote
+
+    def _generate():
+        for row in rows:
+            yield json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + '\n'
+
+    response = StreamingHttpResponse(_generate(), content_type='application/x-ndjson; charset=utf-8')
+    response['Content-Disposition'] = f"attachment; filename*=utf-8''{quote(filename)}"
+    return response
+
+EXPORT_FORMATS = {
+    'xlsx': rows_to_excel_response,
+    'csv': rows_to_csv_response,
+    'ndjson': rows_to_ndjson_response,
+}
+
+def rows_to_export_response(columns, rows, filename, fmt='xlsx'):
+    """
+    format 파라미터(xlsx/csv/ndjson)에 맞는 다운로드 응답 반환
+    filename: 확장자를 제외한 파일명
+    """
+    fmt = (fmt or 'xlsx').lower()
+    render_response = EXPORT_FORMATS.get(fmt)
+    if not render_response:
+        return response_error(f"지원하지 않는 형식입니다: {fmt}")
+    return render_response(columns, rows, f"{filename}.{fmt}")
+
+class KeysetPage:
+    """
+    키셋(커서) 페이지네이션 결과 — (timestamp, id) 기준 내림차순
+    OFFSET/COUNT 없이 인덱스 범위 조회만 하므로 몇 번째 페이지든 비용이 같음
+    """
+    def __init__(self, object_list, next_cursor=None, prev_cursor=None, estimated_total=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.estimated_total = estimated_total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+def encode_cursor(direction, obj=None, field='timestamp'):
+    """
+    ('next'|'prev', 기준 객체) → URL 에 넣을 불투명 토큰 (obj 가 없으면 맨 끝 페이지)
+    """
+    import base64
+    raw = direction if obj is None else f"{direction}|{getattr(obj, field).isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(token):
+    """
+    토큰 → (direction, datetime 또는 None, pk 또는 None), 형식 오류면 None
+    """
+    import base64
+    from django.utils.dateparse import parse_datetime
+
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        parts = raw.split('|')
+        if parts == ['prev']:
+            return 'prev', None, None
+        direction, value, pk = parts
+        value = parse_datetime(value)
+        if direction not in ('next', 'prev') or value is None:
+            return None
+        return direction, value, int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def estimate_count(queryset):
+    """
+    전체 건수 추정값 — PostgreSQL 은 실행계획의 rows 추정치 사용, 그 외 DB 는 None
+    """
+    from django.db import connections
+
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    match = re.search(r'rows=(\d+)', queryset.order_by().explain())
+    return int(match.group(1)) if match else None
+
+def keyset_paginate(queryset, cursor=None, per_page=50, field='timestamp', with_estimate=False):
+    """
+    (field, id) 내림차순 키셋 페이지네이션
+    cursor: encode_cursor 로 만든 토큰 (없으면 첫 페이지)
+    """
+    from django.db.models import Q
+
+    decoded = decode_cursor(cursor)
+    direction, value, pk = decoded if decoded else ('next', None, None)
+
+    if direction == 'next':
+        qs = queryset.order_by(f'-{field}', '-id')
+        if value is not None:
+            qs = qs.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': pk}))
+        rows = list(qs[:per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        has_next, has_previous = has_more, value is not None
+    else:
+        qs = queryset.order_by(field, 'id')
+        if value is not None:
+            qs = qs.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk}))
+        rows = list(qs[:per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next, has_previous = value is not None, has_more
+
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor('next', rows[-1], field) if rows and has_next else None,
+        prev_cursor=encode_cursor('prev', rows[0], field) if rows and has_previous else None,
+        estimated_total=estimate_count(queryset) if with_estimate else None,
+    )
+
+def querystring_with(request, **params):
+    """
+    현재 GET 파라미터에 params 를 덮어쓴 쿼리스트링 (값이 None 이면 제거)
+    """
+    query = request.GET.copy()
+    for key, value in params.items():
+        query.pop(key, None)
+        if value is not None:
+            query[key] = value
+    return query.urlencode()
 
 def parse_grouped_rows(rows):
     """
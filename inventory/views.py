@@ -1,30 +1,37 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, HttpResponse
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST, require_http_methods
 from django.contrib import messages
-from django.db import transaction
-from django.db.models import F, Q, Sum, ExpressionWrapper, IntegerField
-from django.utils.dateparse import parse_date
-from django.utils.timezone import localtime, now
+from django.db import connection, transaction
+from django.db.models import F, Sum, Count, ExpressionWrapper, IntegerField
+from django.db.models.functions import Coalesce
+from django.utils.timezone import localtime, localdate
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.paginator import Paginator
 from django.core.exceptions import ValidationError
 from .forms import UsageStatForm
 
 import json
-import pandas as pd
+from datetime import timedelta
 
 # models/services/utils import (앱 경로에 맞게 수정)
 from .models import (
-    ProductVariant, InventoryLog, InventoryUser, UsageCategory, Item,
-    PendingStockBatch, PendingStockItem, Spec
+    ProductVariant, InventoryLog, InventoryUser, Item,
+    PendingStockBatch, PendingStockItem, Spec, DailyUsage
 )
-from .services.inventory import process_stock_in, process_stock_out
+from .services.inventory import cancel_stock_out, process_stock_batch
+from .services.catalog import get_catalog, register_item
+from .services.search import rank_variants, search_variants, suggest_variants
+from .services.dimensions import get_categories, get_users, get_system_user
+from .services.snapshots import stock_as_of
+from .services.usage_pivot import PIVOT_DIMENSIONS, PIVOT_VALUES, pivot_export_rows, usage_pivot
+from .services.pending import receive_pending_batch, receive_pending_batches, update_batch_quantities
 from .utils import (
-    build_variant_map, response_success, response_error, safe_int, require_fields,
-    extract_json, get_object_or_error, batch_process_stock, apply_filters,
-    dataframe_to_excel_response, parse_grouped_rows
+    response_success, response_error, safe_int, require_fields,
+    extract_json, get_object_or_error, apply_filters,
+    rows_to_export_response, parse_grouped_rows, filter_date_range, safe_date,
+    keyset_paginate, encode_cursor, querystring_with, safe_list
 )
 
 # === 기본 정보/품목 ajax ===
@@ -33,6 +40,34 @@ def get_variants_by_item(request, item_id):
     data = [{'id': variant.id, 'spec_name': variant.spec.label} for variant in variants]
     return response_success({'variants': data})
 
+def search_variants_api(request):
+    """
+    품목 검색 (검색 색인 사용) — 관련도 순 품목규격 id 와 품목 id
+    """
+    query = request.GET.get('q', '')
+    variants = ProductVariant.objects.all()
+    category_id = request.GET.get('category')
+    if category_id and category_id != 'all':
+        variants = variants.filter(item__category_id=category_id)
+    results = search_variants(query, variants)
+    return response_success({
+        'variant_ids': [variant_id for variant_id, _ in results],
+        'item_ids': list(dict.fromkeys(item_id for _, item_id in results)),
+    })
+
+def suggest_variants_api(request):
+    """
+    품목규격 자동완성 — 초성('ㅁㅈㄱ') / 품목명 / 코드 앞부분 일치
+    """
+    limit, _ = safe_int(request.GET.get('limit'))
+    limit = min(max(limit or 20, 1), 50)
+    return response_success({'results': suggest_variants(request.GET.get('q', ''), limit)})
+
+def _variant_label(variant_id):
+    """자동완성 입력칸에 다시 보여줄 선택된 품목규격 이름"""
+    variant = ProductVariant.objects.select_related('item', 'spec').filter(id=safe_int(variant_id)[0]).first()
+    return f"{variant.item.name} - {variant.spec.label}" if variant else ''
+
 @csrf_exempt
 def add_item_ajax(request):
     if request.method == 'POST':
@@ -48,17 +83,7 @@ def add_item_ajax(request):
         name = data.get('name')
         specs = data.get('specs')
 
-        item, created = Item.objects.get_or_create(
-            name=name,
-            category_id=category_id,
-            defaults={'description': None}
-        )
-        existing_specs = set(
-            ProductVariant.objects.filter(item=item).values_list('spec__label', flat=True)
-        )
-        for label in [s.strip() for s in specs.split(',') if s.strip() and s.strip() not in existing_specs]:
-            spec_obj, _ = Spec.objects.get_or_create(label=label)
-            ProductVariant.objects.create(item=item, spec=spec_obj, current_quantity=0, min_quantity=0)
+        item, _ = register_item(name, category_id, specs.split(','))
 
         variants = list(ProductVariant.objects.filter(item=item)
                 .select_related('spec')
@@ -71,57 +96,108 @@ def add_item_ajax(request):
 @require_POST
 def cancel_out_log(request, log_id):
     log = get_object_or_404(InventoryLog, id=log_id, type='OUT')
-    variant = log.variant
-
-    variant.current_quantity += log.quantity
-    variant.save()
-    log.delete()
+    try:
+        cancel_stock_out(log)
+    except ValidationError as ve:
+        messages.error(request, "❌ " + " ".join(ve.messages))
     return redirect('inventory_history')
 
 
 # === 입출고 엑셀/리스트 다운로드 ===
+INVENTORY_LOG_EXPORT_COLUMNS = ['일자', '출하창고', '담당자', '품목코드', '품목명', '규격', '수량', '사용유형', '적요']
+
+def inventory_log_export_rows(logs, chunk_size=2000):
+    """
+    입출고 내역 다운로드용 행 생성 (values_list + iterator 로 모델 인스턴스 없이 순차 조회)
+    """
+    rows = logs.values_list(
+        'timestamp', 'user__name', 'variant__code', 'variant__item__name', 'variant__spec__label', 'quantity'
+    ).iterator(chunk_size=chunk_size)
+    for timestamp, user_name, code, item_name, spec_label, quantity in rows:
+        yield (
+            localtime(timestamp).strftime('%Y-%m-%d'),
+            '1',
+            user_name or '',
+            code or '',
+            item_name,
+            spec_label,
+            quantity,
+            '',
+            '',
+        )
+
 def export_inventory_log(request):
-    logs = InventoryLog.objects.select_related('variant__item', 'variant__spec', 'user')
+    logs = InventoryLog.objects.all()
     field_map = {
         'type': lambda qs, v: qs.filter(type=v) if v in ['IN', 'OUT'] else qs,
         'user': 'user_id',
         'variant': 'variant_id',
-        'start_date': lambda qs, v: qs.filter(timestamp__date__gte=parse_date(v)),
-        'end_date': lambda qs, v: qs.filter(timestamp__date__lte=parse_date(v)),
+        'start_date': lambda qs, v: filter_date_range(qs, start=v),
+        'end_date': lambda qs, v: filter_date_range(qs, end=v),
     }
     logs = apply_filters(logs, request, field_map)
     logs = logs.order_by('-timestamp')
 
-    data = [{
-        '일자': log.timestamp.strftime('%Y-%m-%d'),
-        '출하창고': '1',
-        '담당자': log.user.name if log.user else '',
-        '품목코드': log.variant.code or '',
-        '품목명': log.variant.item.name,
-        '규격': log.variant.spec.label,
-        '수량': log.quantity,
-        '사용유형': '',
-        '적요': '',
-    } for log in logs]
+    return rows_to_export_response(
+        INVENTORY_LOG_EXPORT_COLUMNS,
+        inventory_log_export_rows(logs),
+        "입출고내역_다운로드",
+        request.GET.get('format'),
+    )
+
+
+STOCK_AS_OF_EXPORT_COLUMNS = ['품목코드', '품목명', '규격', '재고', '단가', '금액']
+
+def _stock_as_of_rows(request):
+    """
+    기준일(date, 기본 어제) 마감 재고 행 [{'variant', 'quantity', 'amount'}, ...]
+    """
+    as_of = safe_date(request.GET.get('date')) or localdate() - timedelta(days=1)
+    variants = ProductVariant.objects.select_related('item', 'spec')
+    # 'all' 등 숫자가 아닌 값은 전체로 처리
+    category_id, _ = safe_int(request.GET.get('category'))
+    if category_id:
+        variants = variants.filter(item__category_id=category_id)
+    quantities = stock_as_of(as_of, variants)
+    rows = [
+        {
+            'variant': variant,
+            'quantity': quantities.get(variant.id, 0),
+            'amount': quantities.get(variant.id, 0) * variant.unit_price,
+        }
+        for variant in variants
+    ]
+    return as_of, rows
+
+def stock_as_of_view(request):
+    as_of, rows = _stock_as_of_rows(request)
+    return render(request, 'inventory/stock_as_of.html', {
+        'as_of': as_of,
+        'rows': rows,
+        'total_amount': sum(row['amount'] for row in rows),
+        'selected_category': request.GET.get('category'),
+    })
 
-    df = pd.DataFrame(data)
-    return dataframe_to_excel_response(df, "입출고내역_다운로드.xlsx")
+def export_stock_as_of(request):
+    as_of, rows = _stock_as_of_rows(request)
+    return rows_to_export_response(
+        STOCK_AS_OF_EXPORT_COLUMNS,
+        (
+            (row['variant'].code or '', row['variant'].item.name, row['variant'].spec.label,
+             row['quantity'], row['variant'].unit_price, row['amount'])
+            for row in rows
+        ),
+        f"기준일재고_{as_of:%Y%m%d}",
+        request.GET.get('format'),
+    )
 
 
 # === kiosk 소모 입력/출고 ===
 def kiosk_input(request):
-    users = InventoryUser.objects.exclude(name="system")
-    categories = UsageCategory.objects.all()
+    users = get_users()
+    categories = get_categories()
     selected_category = request.GET.get('category')
 
-    if selected_category and selected_category != "all":
-        variants = ProductVariant.objects.select_related('item', 'spec', 'item__category') \
-            .filter(item__category_id=selected_category) \
-            .order_by('item__name', 'spec__label')
-    else:
-        variants = ProductVariant.objects.select_related('item', 'spec', 'item__category') \
-            .order_by('item__name', 'spec__label')
-
     if request.method == 'POST':
         user_id = request.POST.get('user')
         variant_ids = request.POST.getlist('variant_ids')
@@ -136,39 +212,24 @@ def kiosk_input(request):
             messages.error(request, "❌ 소모할 품목과 수량을 입력해주세요.")
             return redirect('kiosk_input')
 
-        for variant_id, qty in zip(variant_ids, quantities):
-            quantity, err = safe_int(qty)
-            if err:
-                messages.error(request, f"❌ {err}")
-                return redirect('kiosk_input')
-            variant, err = get_object_or_error(ProductVariant, variant_id, "품목을 찾을 수 없습니다.")
-            if err:
-                messages.error(request, f"❌ {err}")
-                return redirect('kiosk_input')
-            try:
-                process_stock_out(variant, quantity, user)
-            except ValidationError as ve:
-                messages.error(request, f"❌ {ve}")
-                return redirect('kiosk_input')
-            except Exception as e:
-                messages.error(request, f"❌ 오류: {e}")
-                return redirect('kiosk_input')
+        entries = [{'id': vid, 'qty': qty} for vid, qty in zip(variant_ids, quantities)]
+        errors = process_stock_batch(entries, 'OUT', user)
+        if errors:
+            messages.error(request, "❌ " + "\n".join(errors))
+            return redirect('kiosk_input')
 
         messages.success(request, "✅ 선택한 품목이 성공적으로 소모 처리되었습니다.")
         return redirect('kiosk_input')
 
-    variant_map = build_variant_map(variants)
-    item_ids = variants.values_list('item_id', flat=True).distinct()
-    items = Item.objects.filter(id__in=item_ids).order_by('name')
+    catalog = get_catalog(selected_category if selected_category != 'all' else None)
 
     return render(request, 'inventory/kiosk_input.html', {
         'users': users,
-        'variants': variants,
-        'items': items,
+        'items': catalog['items'],
         'categories': categories,
         'selected_category': selected_category,
         'page_title': '🔧 소모 입력',
-        'variant_json': json.dumps(variant_map, cls=DjangoJSONEncoder)
+        'variant_json': json.dumps(catalog['variant_map'], cls=DjangoJSONEncoder)
     })
 
 @require_POST
@@ -187,7 +248,7 @@ def kiosk_input_ajax(request):
     if err:
         return response_error(err)
 
-    errors = batch_process_stock(ProductVariant, process_stock_out, variants, user, is_in=False)
+    errors = process_stock_batch(variants, 'OUT', user)
     if errors:
         return response_error("\n".join(errors))
 
@@ -196,15 +257,9 @@ def kiosk_input_ajax(request):
 
 # === 입고(add stock), 재고 현황, 입출고 이력 ===
 def add_stock(request):
-    categories = UsageCategory.objects.all()
+    categories = get_categories()
     selected_category = request.GET.get('category')
-    users = InventoryUser.objects.exclude(name="system")
-
-    variants = ProductVariant.objects.select_related('item', 'spec', 'item__category') \
-        .order_by('item__name', 'spec__label')
-
-    if selected_category and selected_category != 'all':
-        variants = variants.filter(item__category__id=selected_category)
+    users = get_users()
 
     if request.method == 'POST':
         variant_ids = request.POST.getlist('variant_ids')
@@ -214,35 +269,31 @@ def add_stock(request):
             messages.error(request, "❌ 잘못된 요청입니다.")
             return redirect('add_stock')
 
+        # 수량이 비어 있거나 0 이하인 행은 건너뜀
+        entries = []
         for variant_id, qty_str in zip(variant_ids, quantities):
             quantity, err = safe_int(qty_str)
             if err or quantity <= 0:
                 continue
-            variant, err = get_object_or_error(ProductVariant, variant_id, "품목을 찾을 수 없습니다.")
-            if err:
-                messages.error(request, f"❌ {err}")
-                continue
-            try:
-                process_stock_in(variant, quantity)
-            except Exception as e:
-                messages.error(request, f"❌ 오류 발생: {e}")
-                continue
+            entries.append({'id': variant_id, 'qty': quantity})
+
+        errors = process_stock_batch(entries, 'IN')
+        if errors:
+            messages.error(request, "❌ " + "\n".join(errors))
+            return redirect('add_stock')
 
         messages.success(request, "✅ 입고가 완료되었습니다.")
         return redirect('add_stock')
 
-    item_ids = variants.values_list('item_id', flat=True).distinct()
-    items = Item.objects.filter(id__in=item_ids).order_by('name')
-    variant_map = build_variant_map(variants)
+    catalog = get_catalog(selected_category if selected_category != 'all' else None)
 
     return render(request, 'inventory/add_stock.html', {
-        'variants': variants,
-        'items': items,
+        'items': catalog['items'],
         'categories': categories,
         'selected_category': selected_category,
         'users': users,
         'page_title': '📥 입고 추가',
-        'variant_json': json.dumps(variant_map, cls=DjangoJSONEncoder)
+        'variant_json': json.dumps(catalog['variant_map'], cls=DjangoJSONEncoder)
     })
 
 def inventory_status(request):
@@ -250,22 +301,18 @@ def inventory_status(request):
     show_low_stock = request.GET.get('low_stock') == '1'
     query = request.GET.get('q', '')
 
-    variants = ProductVariant.objects.select_related('item', 'spec', 'item__category')
+    variants = ProductVariant.objects.select_related('item', 'spec', 'item__category', 'forecast')
 
     if category_id:
         variants = variants.filter(item__category_id=category_id)
 
     if show_low_stock:
-        variants = variants.filter(current_quantity__lt=F('min_quantity'))
+        variants = variants.filter(is_low=True)
 
     if query:
-        variants = variants.filter(
-            Q(item__name__icontains=query) |
-            Q(item__description__icontains=query) |
-            Q(spec__label__icontains=query)
-        )
+        variants = rank_variants(query, variants)
 
-    categories = UsageCategory.objects.all()
+    categories = get_categories()
     context = {
         'variants': variants,
         'categories': categories,
@@ -290,23 +337,22 @@ def inventory_history(request):
         logs = logs.filter(user__id=user_id)
     if variant_id:
         logs = logs.filter(variant__id=variant_id)
-    if start_date:
-        logs = logs.filter(timestamp__date__gte=start_date)
-    if end_date:
-        logs = logs.filter(timestamp__date__lte=end_date)
+    logs = filter_date_range(logs, start_date, end_date)
 
-    paginator = Paginator(logs, 50)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = keyset_paginate(logs, request.GET.get('cursor'), per_page=50, with_estimate=True)
 
     return render(request, 'inventory/inventory_history.html', {
         'logs': page_obj,
         'filter_type': filter_type,
         'page_obj': page_obj,
-        'users': InventoryUser.objects.all(),
+        'first_query': querystring_with(request, cursor=None),
+        'next_query': querystring_with(request, cursor=page_obj.next_cursor) if page_obj.has_next else None,
+        'prev_query': querystring_with(request, cursor=page_obj.prev_cursor) if page_obj.has_previous else None,
+        'last_query': querystring_with(request, cursor=encode_cursor('prev')),
+        'users': get_users(include_system=True),
         'selected_user': user_id,
         'selected_variant': variant_id,
-        'variants': ProductVariant.objects.select_related('item', 'spec'),
+        'selected_variant_label': _variant_label(variant_id) if variant_id else '',
         'start_date': start_date,
         'end_date': end_date,
     })
@@ -327,7 +373,7 @@ def add_stock_ajax(request):
     if err:
         return response_error(err)
 
-    errors = batch_process_stock(ProductVariant, process_stock_in, variants, user, is_in=True)
+    errors = process_stock_batch(variants, 'IN', user)
     if errors:
         return response_error("\n".join(errors))
 
@@ -405,29 +451,35 @@ def paste_table_upload(request):
             messages.error(request, "입고 대기 등록 실패.\n" + "\n".join(error_lines))
             return redirect('paste_table_upload')
 
-        # ===== 2) 저장 (거래처별 Batch 분리, 기존 동작 유지) =====
+        # ===== 2) 저장 (거래처별 Batch 분리, 기존 동작 유지) — 거래처 수와 관계없이 Batch/품목 bulk_create 각 1회 =====
         with transaction.atomic():
-            for (date, supplier), items in grouped.items():
-                supplier_norm = _normalize_supplier(supplier)
-                batch = PendingStockBatch.objects.create(
-                    supplier=supplier_norm,
+            batches = [
+                PendingStockBatch(
+                    supplier=_normalize_supplier(supplier),
                     uploaded_at=date,  # 기존 로직 유지(수동 지정)
                     status='PENDING',
                 )
-
-                # PendingStockItem bulk 생성
-                psi_rows = []
-                for (item_name, spec_label, quantity, _idx) in items:
-                    item_obj = items_by_name[item_name.strip()]
-                    spec_obj = specs_by_label[spec_label.strip()]
-                    psi_rows.append(PendingStockItem(
-                        batch=batch,
-                        item=item_obj,
-                        spec=spec_obj,
-                        quantity=int(quantity)
-                    ))
-                if psi_rows:
-                    PendingStockItem.objects.bulk_create(psi_rows, batch_size=1000)
+                for (date, supplier) in grouped
+            ]
+            if connection.features.can_return_rows_from_bulk_insert:
+                PendingStockBatch.objects.bulk_create(batches)
+            else:
+                # bulk_create 가 pk 를 돌려주지 않는 DB
+                for batch in batches:
+                    batch.save()
+
+            psi_rows = [
+                PendingStockItem(
+                    batch=batch,
+                    item=items_by_name[item_name.strip()],
+                    spec=specs_by_label[spec_label.strip()],
+                    quantity=int(quantity),
+                )
+                for batch, items in zip(batches, grouped.values())
+                for (item_name, spec_label, quantity, _idx) in items
+            ]
+            if psi_rows:
+                PendingStockItem.objects.bulk_create(psi_rows, batch_size=1000)
 
         messages.success(request, "✅ 입고 대기 등록이 완료되었습니다.")
         return redirect('pending_stock_list')
@@ -435,52 +487,45 @@ def paste_table_upload(request):
     return render(request, 'inventory/paste_pending_stock.html')
 
 def pending_stock_list(request):
-    pending_batches = PendingStockBatch.objects.filter(status='PENDING').order_by('-uploaded_at')
-    done_batches = PendingStockBatch.objects.filter(status='DONE').order_by('-uploaded_at')
+    batches = PendingStockBatch.objects.annotate(
+        line_count=Count('items'),
+        total_quantity=Coalesce(Sum('items__quantity'), 0),
+    ).order_by('-uploaded_at')
+    pending_batches = list(batches.filter(status='PENDING'))
+    done_batches = Paginator(batches.filter(status='DONE'), 30).get_page(request.GET.get('page'))
 
-    for batch in pending_batches:
-        batch.formatted_date = localtime(batch.uploaded_at).strftime('%Y.%m.%d')
     for batch in done_batches:
         batch.formatted_date = localtime(batch.uploaded_at).strftime('%Y.%m.%d')
 
     return render(request, 'inventory/pending_stock_list.html', {
         'pending_batches': pending_batches,
         'done_batches': done_batches,
+        'page_obj': done_batches,
     })
-    
-def pending_stock_items(request, batch_id):
-    try:
-        batch = PendingStockBatch.objects.get(id=batch_id)
-    except PendingStockBatch.DoesNotExist:
-        return JsonResponse({"error": "입고 대기건을 찾을 수 없습니다."}, status=404)
-
-    items = PendingStockItem.objects.filter(batch=batch)
-    data = {
-        "supplier": batch.supplier,
-        "items": [
-            {
-                "id": item.id,
-                "item": item.item.name,
-                "spec_label": item.spec.label,
-                "quantity": item.quantity,
-            }
-            for item in items
-        ]
-    }
-    return JsonResponse(data)
 
 def get_batch_items(request, batch_id):
     batch = get_object_or_404(PendingStockBatch, id=batch_id)
-    items = batch.items.select_related('item', 'spec')
+    items = batch.items.select_related('item', 'spec').order_by('id')
     data = [
         {
             'id': i.id,
             'item': f"{i.item.name} - {i.spec.label}",
+            'item_id': i.item_id,
+            'item_name': i.item.name,
+            'spec_id': i.spec_id,
+            'spec_label': i.spec.label,
             'quantity': i.quantity
         }
         for i in items
     ]
-    return response_success({'batch_id': batch.id, 'supplier': batch.supplier, 'items': data})
+    return response_success({
+        'batch_id': batch.id,
+        'supplier': batch.supplier,
+        'status': batch.status,
+        'line_count': len(data),
+        'total_quantity': sum(i['quantity'] for i in data),
+        'items': data,
+    })
 
 def process_pending_stock(request, batch_id):
     if request.method != 'POST':
@@ -492,62 +537,77 @@ def process_pending_stock(request, batch_id):
         return response_error('데이터 파싱 오류')
     new_quantities = data.get('quantities', [])
 
-    system_user, _ = InventoryUser.objects.get_or_create(name="system")
-    update_map = {int(entry["id"]): int(entry["qty"]) for entry in new_quantities if int(entry["qty"]) > 0}
-    entries = list(batch.items.select_related('item', 'spec'))
-    db_ids = [entry.id for entry in entries if entry.id in update_map]
+    system_user = get_system_user()
+    try:
+        update_map = {int(entry["id"]): int(entry["qty"]) for entry in new_quantities if int(entry["qty"]) > 0}
+    except (KeyError, TypeError, ValueError):
+        return response_error('데이터 파싱 오류')
 
-    if len(db_ids) != len(update_map):
-        return response_error(
-            f'❌ 전송된 항목 수와 실제 항목 수가 일치하지 않습니다. (전송 {len(update_map)}건, 매칭된 {len(db_ids)}건)'
-        )
+    try:
+        missing = receive_pending_batch(batch, update_map, system_user)
+    except ValidationError as ve:
+        return response_error("❌ " + "\n".join(ve.messages))
 
-    with transaction.atomic():
-        for entry in entries:
-            new_qty = update_map.get(entry.id)
-            if not new_qty:
-                continue
-            entry.quantity = new_qty
-            entry.save()
-            try:
-                variant = ProductVariant.objects.get(item=entry.item, spec=entry.spec)
-                process_stock_in(variant, new_qty, user=system_user)
-            except ProductVariant.DoesNotExist:
-                continue
-            except ValidationError as ve:
-                return response_error(f"❌ {ve}")
+    message = f"✅ '{batch.supplier}' 입고건이 처리되었습니다."
+    if missing:
+        message += "\n⚠️ 입고 제외:\n" + "\n".join(missing)
+    return response_success(message)
+
+@require_POST
+def process_pending_batches(request):
+    """
+    여러 입고 대기건 일괄 입고
+    body: {"batch_ids": [1, 2, ...], "overrides": [{"id": 품목행 id, "qty": 수량}, ...]}
+    """
+    data, err = extract_json(request)
+    if err:
+        return response_error('데이터 파싱 오류')
+    batch_ids, err = safe_list(data.get('batch_ids'), "처리할 입고건을 선택해주세요.")
+    if err:
+        return response_error(err)
+    try:
+        batch_ids = [int(batch_id) for batch_id in batch_ids]
+        overrides = {int(entry["id"]): int(entry["qty"]) for entry in data.get('overrides', [])}
+    except (KeyError, TypeError, ValueError):
+        return response_error('데이터 파싱 오류')
 
-        batch.status = 'DONE'
-        batch.processed_at = now()
-        batch.processed_by = system_user
-        batch.save()
+    system_user = get_system_user()
+    try:
+        results = receive_pending_batches(batch_ids, overrides, system_user)
+    except ValidationError as ve:
+        return response_error("❌ " + "\n".join(ve.messages))
 
-    return response_success(f"✅ '{batch.supplier}' 입고건이 처리되었습니다.")
+    message = f"✅ 입고건 {len(results)}건이 처리되었습니다."
+    missing = [line for row in results for line in row['missing']]
+    if missing:
+        message += "\n⚠️ 입고 제외:\n" + "\n".join(missing)
+    return response_success(message, {'batches': results})
 
 def update_pending_quantities(request):
     if request.method == 'POST':
         data, err = extract_json(request)
         if err:
             return response_error('데이터 파싱 오류')
-        batch_id = data.get('batch_id')
+        batch_id, err = safe_int(data.get('batch_id'), "유효하지 않은 입고건입니다.")
+        if err:
+            return response_error(err)
         updates = data.get('updates', [])
         if not isinstance(updates, list):
             return response_error("updates는 리스트여야 합니다.")
 
-        batch = PendingStockBatch.objects.get(id=batch_id, status='PENDING')
-        update_map = {int(u['id']): int(u['quantity']) for u in updates}
+        try:
+            update_map = {int(u['id']): int(u['quantity']) for u in updates}
+        except (KeyError, TypeError, ValueError):
+            return response_error('데이터 파싱 오류')
 
-        entries = batch.items.all()
-        for entry in entries:
-            if entry.id not in update_map:
-                return response_error(f"ID {entry.id} 수량 누락")
-            quantity = update_map[entry.id]
-            if quantity <= 0:
-                return response_error('수량은 1 이상이어야 합니다.')
-            entry.quantity = quantity
-            entry.save()
+        try:
+            changed = update_batch_quantities(batch_id, update_map)
+        except ValidationError as ve:
+            return response_error("\n".join(ve.messages))
 
-        return response_success('✅ 수량이 수정되었습니다.')
+        return response_success('✅ 수량이 수정되었습니다.', {
+            'updated': [{'id': entry.id, 'quantity': entry.quantity} for entry in changed]
+        })
     return response_error('잘못된 요청입니다.')
 
 def cancel_pending_stock(request, batch_id):
@@ -557,11 +617,9 @@ def cancel_pending_stock(request, batch_id):
     return response_success('❌ 입고 대기 건이 취소되었습니다.')
 
 def usage_stat_view(request):
-    # 사용자, 품목+규격 목록 (폼 드롭다운용)
-    user_choices = [(str(u.id), u.name) for u in InventoryUser.objects.exclude(name="system")]
-    variant_choices = [(str(v.id), f"{v.item.name} - {v.spec.label}") for v in ProductVariant.objects.select_related('item', 'spec')]
-
-    form = UsageStatForm(request.GET or None, user_choices=user_choices, variant_choices=variant_choices)
+    # 사용자 목록 (폼 드롭다운용), 품목+규격은 자동완성
+    user_choices = [(str(u.id), u.name) for u in get_users()]
+    form = UsageStatForm(request.GET or None, user_choices=user_choices)
 
     stats = []
     total_amount = 0
@@ -572,11 +630,11 @@ def usage_stat_view(request):
         user_id = form.cleaned_data.get('user')
         variant_id = form.cleaned_data.get('variant')
 
-        qs = InventoryLog.objects.filter(type='OUT')
+        qs = DailyUsage.objects.filter(type='OUT')
         if start:
-            qs = qs.filter(timestamp__date__gte=start)
+            qs = qs.filter(date__gte=start)
         if end:
-            qs = qs.filter(timestamp__date__lte=end)
+            qs = qs.filter(date__lte=end)
         if user_id:
             qs = qs.filter(user_id=user_id)
         if variant_id:
@@ -591,6 +649,7 @@ def usage_stat_view(request):
                     output_field=IntegerField()
                 ),
             )
+            .filter(total_quantity__gt=0)
             .order_by('-amount')
         )
         stats = list(stats_qs)
@@ -598,22 +657,23 @@ def usage_stat_view(request):
         
     return render(request, 'inventory/usage_stat.html', {
         'form': form,
+        'selected_variant_label': _variant_label(request.GET.get('variant')) if request.GET.get('variant') else '',
         'stats': stats,
         'total_amount': total_amount,
     })
     
 def export_usage_stat_excel(request):
     # 기존 통계 쿼리와 동일하게 필터 적용
-    start = request.GET.get('start_date')
-    end = request.GET.get('end_date')
+    start = safe_date(request.GET.get('start_date'))
+    end = safe_date(request.GET.get('end_date'))
     user_id = request.GET.get('user')
     variant_id = request.GET.get('variant')
 
-    qs = InventoryLog.objects.filter(type='OUT')
+    qs = DailyUsage.objects.filter(type='OUT')
     if start:
-        qs = qs.filter(timestamp__date__gte=start)
+        qs = qs.filter(date__gte=start)
     if end:
-        qs = qs.filter(timestamp__date__lte=end)
+        qs = qs.filter(date__lte=end)
     if user_id:
         qs = qs.filter(user_id=user_id)
     if variant_id:
@@ -629,18 +689,58 @@ def export_usage_stat_excel(request):
             F('variant__unit_price') * Sum('quantity'),
             output_field=IntegerField()
         ),
-    ).order_by('-amount')
+    ).filter(total_quantity__gt=0).order_by('-amount')
+
+    return rows_to_export_response(
+        ['품목', '규격', '단가', '사용수량', '금액'],
+        (
+            (row['variant__item__name'], row['variant__spec__label'], row['variant__unit_price'],
+             row['total_quantity'], row['amount'])
+            for row in stats
+        ),
+        "품목별소모통계_다운로드",
+        request.GET.get('format'),
+    )
+
+def _usage_pivot_from_request(request):
+    return usage_pivot(
+        rows=request.GET.get('rows', 'category'),
+        cols=request.GET.get('cols', 'month'),
+        value=request.GET.get('value', 'amount'),
+        start=safe_date(request.GET.get('start_date')),
+        end=safe_date(request.GET.get('end_date')),
+    )
+
+def usage_pivot_api(request):
+    """
+    사용처 × 사용자 × 월 소모 피벗 — format=json(기본) 또는 xlsx
+    ?rows=category&cols=month&value=amount&start_date=&end_date=
+    """
+    try:
+        result = _usage_pivot_from_request(request)
+    except ValidationError as ve:
+        return response_error(" ".join(ve.messages))
 
-    # 집계 데이터를 pandas DataFrame으로 변환
-    data = [
-        {
-            '품목': row['variant__item__name'],
-            '규격': row['variant__spec__label'],
-            '단가': row['variant__unit_price'],
-            '사용수량': row['total_quantity'],
-            '금액': row['amount'],
-        }
-        for row in stats
-    ]
-    df = pd.DataFrame(data)
-    return dataframe_to_excel_response(df, "품목별소모통계_다운로드.xlsx")
\ No newline at end of file
+    fmt = request.GET.get('format', 'json')
+    if fmt == 'json':
+        return response_success(result)
+    header, rows = pivot_export_rows(result)
+    return rows_to_export_response(header, rows, "소모피벗_다운로드", fmt)
+
+def usage_pivot_view(request):
+    try:
+        result = _usage_pivot_from_request(request)
+    except ValidationError as ve:
+        messages.error(request, "❌ " + " ".join(ve.messages))
+        return redirect('usage_pivot')
+
+    header, rows = pivot_export_rows(result)
+    return render(request, 'inventory/usage_pivot.html', {
+        'result': result,
+        'header': header,
+        'rows': rows,
+        'dimensions': {name: label for name, (_, label) in PIVOT_DIMENSIONS.items()},
+        'value_labels': PIVOT_VALUES,
+        'start_date': request.GET.get('start_date', ''),
+        'end_date': request.GET.get('end_date', ''),
+    })